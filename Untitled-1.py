@@ -1,18 +1,16 @@
-from transformers import T5Tokenizer, T5ForConditionalGeneration
+from t5_server import T5Generator
 
-# Load the fine-tuned model
-model_path = r"C:\Users\Sheid_heda\Desktop\Oviya\fine_tune_t5.py"  # Replace with your actual model path
-tokenizer = T5Tokenizer.from_pretrained(model_path)
-model = T5ForConditionalGeneration.from_pretrained(model_path)
+# Load the fine-tuned model once; the generator batches and caches requests
+# (run t5_server.py to share one loaded model between processes)
+model_path = r"C:\Users\Sheid_heda\Desktop\Oviya\finetuned_model"  # Replace with your actual model path
+generator = T5Generator(model_path)
 
 # Test the model
 def generate_answer(question, context):
-    input_text = f"question: {question} context: {context}"
-    inputs = tokenizer(input_text, return_tensors="pt", max_length=512, truncation=True)
-    outputs = model.generate(inputs.input_ids, max_length=50, num_beams=5, early_stopping=True)
-    return tokenizer.decode(outputs[0], skip_special_tokens=True)
+    return generator.generate(question, context)
 
 # Example usage
-question = "What are the best investment options for high-risk tolerance?"
-context = "High-risk investments include stocks, cryptocurrencies, and equity funds."
-print(generate_answer(question, context))
+if __name__ == "__main__":
+    question = "What are the best investment options for high-risk tolerance?"
+    context = "High-risk investments include stocks, cryptocurrencies, and equity funds."
+    print(generate_answer(question, context))
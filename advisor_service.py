@@ -0,0 +1,256 @@
+# Async HTTP service for the headless advisor (headless.Advisor), for backends that need
+# advice at hundreds of requests per second without a Streamlit session.
+#
+#     python advisor_service.py --dataset FINAL_DATASET.xlsx --workers 4 --port 8700
+#
+# POST /advice        {"income", "expenditure", "savings", "risk_tolerance"} -> advice record
+#                     with suggestions, growth series and top funds
+# POST /advice/batch  {"profiles": [...]} -> {"results": [...]}, one record per profile in
+#                     request order, with any extra profile fields (e.g. a client id) copied in
+# GET  /health
+# GET  /metrics       Prometheus text from the instrumentation module (with --instrument)
+#
+# The dataset, growth index and fund universe are built once in the parent process, which
+# then forks the workers: every worker serves from the same copy-on-write memory pages,
+# and gc.freeze() keeps the garbage collector from touching (and so copying) them. All
+# workers accept on one listening socket. Where fork is unavailable (Windows) the service
+# runs a single worker.
+import argparse
+import asyncio
+import gc
+import json
+import math
+import os
+import signal
+import socket
+import sys
+import time
+
+import pandas as pd
+
+import instrumentation
+from headless import DATASET_ENV, DEFAULT_DATASET, NON_FINITE_ERROR, PROFILE_COLUMNS, TOP_K, Advisor
+
+DEFAULT_PORT = 8700
+
+# Larger bodies are rejected with 413
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+# Batches at least this large are scored in a thread so the event loop keeps serving
+THREAD_BATCH_SIZE = 1000
+
+# Idle keep-alive connections are closed after this many seconds
+KEEP_ALIVE_TIMEOUT = 30
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _profile(payload):
+    if not isinstance(payload, dict):
+        raise BadRequest("profile must be a JSON object")
+    try:
+        income, expenditure, savings = (float(payload.get(name) or 0) for name in ("income", "expenditure", "savings"))
+    except (TypeError, ValueError):
+        raise BadRequest("income, expenditure and savings must be numbers")
+    if not all(math.isfinite(value) for value in (income, expenditure, savings)):
+        raise BadRequest(NON_FINITE_ERROR)
+    risk_tolerance = payload.get("risk_tolerance")
+    if not isinstance(risk_tolerance, str):
+        raise BadRequest("risk_tolerance is required")
+    return income, expenditure, savings, risk_tolerance
+
+
+class AdvisorApp:
+    def __init__(self, advisor):
+        self.advisor = advisor
+
+    async def dispatch(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok", "pid": os.getpid()}
+        if path == "/metrics":
+            return 200, instrumentation.prometheus_text()
+        if path not in ("/advice", "/advice/batch"):
+            return 404, {"error": "not found"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise BadRequest("body is not valid JSON")
+
+        if path == "/advice":
+            with instrumentation.span("advice"):
+                return 200, self.advisor.advise(*_profile(payload))
+
+        profiles = payload.get("profiles") if isinstance(payload, dict) else None
+        if not isinstance(profiles, list):
+            raise BadRequest("profiles must be a list")
+        # Validated amounts replace the given ones; other fields pass through to the records
+        rows = [{**profile, **dict(zip(PROFILE_COLUMNS, _profile(profile)))} for profile in profiles]
+        frame = pd.DataFrame(rows, columns=list(dict.fromkeys(PROFILE_COLUMNS + [name for row in rows for name in row])))
+        with instrumentation.span("advice_batch"):
+            if len(frame) >= THREAD_BATCH_SIZE:
+                results = await asyncio.to_thread(self.advisor.advise_batch, frame)
+            else:
+                results = self.advisor.advise_batch(frame)
+        return 200, {"results": results}
+
+    # HTTP/1.1 with keep-alive; requests need a Content-Length (no chunked bodies)
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "invalid Content-Length"}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                path = target.split("?", 1)[0]
+                started = time.perf_counter()
+                try:
+                    status, response = await self.dispatch(method, path, body)
+                except BadRequest as e:
+                    status, response = 400, {"error": str(e)}
+                except Exception as e:
+                    status, response = 500, {"error": str(e)}
+                instrumentation.observe("request_seconds", time.perf_counter() - started, path=path, status=status)
+
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, response, keep_alive):
+        if isinstance(response, str):
+            body, content_type = response.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(response).encode("utf-8"), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def listening_socket(host, port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    sock.setblocking(False)
+    return sock
+
+
+def run_worker(app, sock):
+    async def serve():
+        server = await asyncio.start_server(app.handle, sock=sock)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+# Serve `advisor` on host:port with `workers` forked processes (1 runs in this process)
+def serve(advisor, host="127.0.0.1", port=DEFAULT_PORT, workers=1):
+    app = AdvisorApp(advisor)
+    sock = listening_socket(host, port)
+    print(f"Advisor service listening on http://{host}:{sock.getsockname()[1]} with {workers} worker(s)")
+    sys.stdout.flush()
+
+    if workers <= 1 or not hasattr(os, "fork"):
+        run_worker(app, sock)
+        return
+
+    # Everything built so far is shared with the workers; keep the collector off it
+    gc.collect()
+    gc.freeze()
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            run_worker(app, sock)
+            os._exit(0)
+        children.append(pid)
+
+    def stop(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        stop(signal.SIGINT, None)
+        for pid in children:
+            os.waitpid(pid, 0)
+    finally:
+        sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP service for investment advice")
+    parser.add_argument("--dataset", default=os.environ.get(DATASET_ENV, DEFAULT_DATASET))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--instrument", action="store_true", help="record spans, served per worker at /metrics")
+    args = parser.parse_args()
+    if args.instrument:
+        instrumentation.enable()
+
+    serve(Advisor.from_path(args.dataset, args.top_k), args.host, args.port, args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
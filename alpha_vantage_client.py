@@ -0,0 +1,376 @@
+# Alpha Vantage HTTP client shared by every Streamlit session in a process:
+# - one requests.Session, so connections are pooled and kept alive
+# - in-memory (LRU, bounded) and on-disk TTL cache keyed by (function, symbol, options);
+#   daily series stay valid until the next US market close
+# - token-bucket rate limiter sized to the free 5 calls/minute quota
+# - concurrent requests for the same key are coalesced into one HTTP call
+# - FixtureServer serves canned JSON locally so the client can be used offline
+import datetime as dt
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from itertools import chain
+from operator import itemgetter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentation import count, span
+
+BASE_URL = "https://www.alphavantage.co/query"
+
+# The API key and endpoint can be overridden from the environment
+API_KEY_ENV = "ALPHAVANTAGE_API_KEY"
+BASE_URL_ENV = "ALPHAVANTAGE_BASE_URL"
+CACHE_DIR_ENV = "ALPHAVANTAGE_CACHE_DIR"
+
+# Free tier quota
+CALLS_PER_MINUTE = 5
+
+# Payloads kept in memory; a full daily series is several MB, older ones stay on disk
+MEMORY_CACHE_ENTRIES = 64
+
+# Daily/weekly/monthly series only change after the US market closes
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+MARKET_CLOSE = dt.time(16, 0)
+END_OF_DAY_FUNCTIONS = {
+    "TIME_SERIES_DAILY",
+    "TIME_SERIES_DAILY_ADJUSTED",
+    "TIME_SERIES_WEEKLY",
+    "TIME_SERIES_WEEKLY_ADJUSTED",
+    "TIME_SERIES_MONTHLY",
+    "TIME_SERIES_MONTHLY_ADJUSTED",
+}
+
+# Everything else (quotes, intraday) is cached for a short time only
+DEFAULT_TTL = 60
+
+
+class AlphaVantageError(Exception):
+    pass
+
+
+# Rate limit reached, either locally (non-blocking acquire) or reported by the API
+class RateLimitError(AlphaVantageError):
+    pass
+
+
+# Latest weekday market close at or before `now` (exchange holidays are not modelled)
+def last_market_close(now=None):
+    now = (now or dt.datetime.now(dt.timezone.utc)).astimezone(MARKET_TIMEZONE)
+    close = dt.datetime.combine(now.date(), MARKET_CLOSE, tzinfo=MARKET_TIMEZONE)
+    if now < close:
+        close -= dt.timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= dt.timedelta(days=1)
+    return close
+
+
+# Next weekday market close strictly after `now` (exchange holidays are not modelled)
+def next_market_close(now=None):
+    now = (now or dt.datetime.now(dt.timezone.utc)).astimezone(MARKET_TIMEZONE)
+    close = dt.datetime.combine(now.date(), MARKET_CLOSE, tzinfo=MARKET_TIMEZONE)
+    if now >= close:
+        close += dt.timedelta(days=1)
+    while close.weekday() >= 5:
+        close += dt.timedelta(days=1)
+    return close
+
+
+def cache_expiry(function, now=None):
+    now = now or dt.datetime.now(dt.timezone.utc)
+    if function in END_OF_DAY_FUNCTIONS:
+        return next_market_close(now).timestamp()
+    return now.timestamp() + DEFAULT_TTL
+
+
+# Typed frame from a TIME_SERIES_* payload: DatetimeIndex named Date in ascending order and
+# one column per field ("1. open" -> "open"). Prices use `dtype` (np.float32 halves the memory
+# of large watch-lists), volume columns stay int64. Every value is converted in a single
+# NumPy call instead of one float() per cell.
+def parse_time_series(payload, dtype=np.float64):
+    series_key = next((name for name in payload if name.startswith("Time Series")), None)
+    if series_key is None:
+        raise AlphaVantageError("Payload does not contain a time series")
+    time_series = payload[series_key]
+    if not time_series:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+
+    fields = list(next(iter(time_series.values())))
+    names = [field.split(". ", 1)[-1] for field in fields]
+    dates = np.array(list(time_series), dtype="datetime64[ns]")
+    values = np.array(
+        list(chain.from_iterable(map(itemgetter(*fields), time_series.values()))), dtype=np.float64
+    ).reshape(len(dates), len(fields))
+
+    # Alpha Vantage returns newest first, so usually reversing is enough
+    if len(dates) > 1 and dates[0] > dates[-1] and (np.diff(dates) < np.timedelta64(0)).all():
+        order = slice(None, None, -1)
+    else:
+        order = np.argsort(dates, kind="stable")
+
+    columns = {
+        name: values[order, i].astype(np.int64 if "volume" in name else dtype)
+        for i, name in enumerate(names)
+    }
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(dates[order], name="Date"))
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute=CALLS_PER_MINUTE, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # Take one token, waiting for a refill if needed; returns False if that would exceed timeout
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+# Default for get(rate_limit_timeout=...): use the client's own setting
+_CLIENT_DEFAULT = object()
+
+
+class AlphaVantageClient:
+    def __init__(self, api_key=None, base_url=None, cache_dir=None, rate_per_minute=CALLS_PER_MINUTE,
+                 rate_limit_timeout=None, session=None, pool_size=10, request_timeout=30,
+                 memory_entries=MEMORY_CACHE_ENTRIES):
+        self.api_key = api_key or os.environ.get(API_KEY_ENV) or "your_alpha_vantage_api_key"
+        self.base_url = base_url or os.environ.get(BASE_URL_ENV) or BASE_URL
+        self.cache_dir = cache_dir if cache_dir is not None else os.environ.get(CACHE_DIR_ENV)
+        self.rate_limit_timeout = rate_limit_timeout
+        self.request_timeout = request_timeout
+        self.bucket = TokenBucket(rate_per_minute)
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    # Cached JSON payload for an Alpha Vantage function, e.g. get("TIME_SERIES_DAILY", "MSFT").
+    # rate_limit_timeout overrides the client's for this call (None waits for a token).
+    def get(self, function, symbol, rate_limit_timeout=_CLIENT_DEFAULT, **params):
+        key = self._cache_key(function, symbol, params)
+
+        payload = self._cache_lookup(key)
+        if payload is not None:
+            return payload
+
+        # Only the first caller for a key performs the request, the rest wait on its future
+        with self._lock:
+            # An owner may have finished between the lookup above and taking the lock
+            payload = self._memory_get(key, time.time())
+            if payload is not None:
+                count("http_cache", result="memory_hit")
+                return payload
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+        if not owner:
+            count("http_cache", result="coalesced")
+            return future.result()
+        count("http_cache", result="miss")
+
+        try:
+            if rate_limit_timeout is _CLIENT_DEFAULT:
+                rate_limit_timeout = self.rate_limit_timeout
+            payload = self._fetch(function, symbol, params, rate_limit_timeout)
+            self._cache_store(key, function, payload)
+            future.set_result(payload)
+            return payload
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _fetch(self, function, symbol, params, rate_limit_timeout):
+        if not self.bucket.acquire(rate_limit_timeout):
+            raise RateLimitError("Local Alpha Vantage rate limit reached, try again shortly.")
+
+        query = {"function": function, "symbol": symbol, "apikey": self.api_key, **params}
+        with span("http_fetch", function=function):
+            response = self.session.get(self.base_url, params=query, timeout=self.request_timeout)
+            response.raise_for_status()
+            payload = response.json()
+
+        # Errors come back as 200 responses with a single message field
+        if "Note" in payload or "Information" in payload:
+            raise RateLimitError(payload.get("Note") or payload.get("Information"))
+        if "Error Message" in payload:
+            raise AlphaVantageError(payload["Error Message"])
+        return payload
+
+    def _cache_key(self, function, symbol, params):
+        options = "&".join(f"{name}={params[name]}" for name in sorted(params))
+        return f"{function}:{symbol.upper()}:{options}"
+
+    def _cache_file(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    # Memory cache entry for key, or None; expired entries are dropped. Caller holds _lock.
+    def _memory_get(self, key, now):
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return entry[1]
+
+    # Caller holds _lock
+    def _memory_put(self, key, expires, payload):
+        self._memory[key] = (expires, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _cache_lookup(self, key):
+        now = time.time()
+        with self._lock:
+            payload = self._memory_get(key, now)
+        if payload is not None:
+            count("http_cache", result="memory_hit")
+            return payload
+
+        if self.cache_dir:
+            try:
+                with open(self._cache_file(key), encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            if entry.get("key") == key and entry.get("expires", 0) > now:
+                with self._lock:
+                    self._memory_put(key, entry["expires"], entry["payload"])
+                count("http_cache", result="disk_hit")
+                return entry["payload"]
+        return None
+
+    def _cache_store(self, key, function, payload):
+        expires = cache_expiry(function)
+        with self._lock:
+            self._memory_put(key, expires, payload)
+
+        # The disk cache is best effort: on a read-only or missing cache dir the payload
+        # is still returned and kept in memory
+        if self.cache_dir:
+            tmp_path = None
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"key": key, "expires": expires, "payload": payload}, f)
+                os.replace(tmp_path, self._cache_file(key))
+            except OSError:
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def clear_cache(self):
+        with self._lock:
+            self._memory.clear()
+
+
+# Like the real API, outputsize=compact only returns the latest 100 data points
+COMPACT_SIZE = 100
+
+
+def _compact_fixture(body):
+    payload = json.loads(body)
+    for name, series in payload.items():
+        if name.startswith("Time Series") and isinstance(series, dict):
+            latest = sorted(series, reverse=True)[:COMPACT_SIZE]
+            payload[name] = {date: series[date] for date in latest}
+    return json.dumps(payload).encode("utf-8")
+
+
+# Local stand-in for the Alpha Vantage endpoint. Serves <FUNCTION>_<SYMBOL>.json from
+# fixture_dir (e.g. TIME_SERIES_DAILY_MSFT.json), trims it for outputsize=compact and
+# counts requests, so the client can be exercised offline:
+#     with FixtureServer("fixtures") as server:
+#         client = AlphaVantageClient(base_url=server.url)
+class FixtureServer:
+    def __init__(self, fixture_dir, host="127.0.0.1", port=0):
+        self.fixture_dir = fixture_dir
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                query = parse_qs(urlparse(self.path).query)
+                function = query.get("function", [""])[0]
+                symbol = query.get("symbol", [""])[0].upper()
+                path = os.path.join(server.fixture_dir, f"{function}_{symbol}.json")
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        body = f.read()
+                    if query.get("outputsize", ["compact"])[0] == "compact":
+                        body = _compact_fixture(body)
+                else:
+                    body = json.dumps({"Error Message": f"No fixture for {function} {symbol}"}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self.httpd.server_address[1]}/query"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
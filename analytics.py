@@ -0,0 +1,157 @@
+# Advice computations shared by app.py, investment_advisor.py and headless workers.
+# Only NumPy and pandas are imported here so this module stays cheap to import
+# without Streamlit or Plotly.
+import numpy as np
+import pandas as pd
+
+RETURNS_COLUMNS = ["returns_1yr", "returns_3yr", "returns_5yr"]
+
+# Return horizon used for each risk tolerance level (anything else is treated as High)
+RISK_RETURNS_COLUMN = {
+    "Low": "returns_1yr",
+    "Medium": "returns_3yr",
+    "High": "returns_5yr",
+}
+
+# Investment suggestions based on risk tolerance
+INVESTMENT_SUGGESTIONS = {
+    "Low": """
+    - Fixed Deposits (FDs): Safe with guaranteed returns.
+    - Sovereign Gold Bonds (SGBs):  Safe and tangible, but includes storage costs and risks like theft.
+    - Government Bonds: Lower risk with steady returns.
+    - Public Provident Fund (PPF): Long-term savings with tax benefits.
+    - Savings Accounts: Low return, but liquid and safe.
+    """,
+    "Medium": """
+    - Balanced Mutual Funds: Mix of equity and debt for moderate risk.
+    - Gold Mutual Funds: Subject to gold price volatility and fund management strategies.
+    - Real Estate: Invest in property for steady growth.
+    - Corporate Bonds: Moderate risk with better returns than government bonds.
+    - Index Funds: Diversified equity fund for medium-risk tolerance.
+    """,
+    "High": """
+    - Stocks (Equities): High risk but potential for high returns.
+    - Gold Mining Stocks:  Risk depends on company performance and gold prices.
+    - Equity Mutual Funds: Invest in high-growth sectors for higher returns.
+    - Cryptocurrencies: Highly volatile, suitable for aggressive investors.
+    - Venture Capital: Invest in start-ups or private equity for high risk/reward.
+    """
+}
+
+
+def returns_column_for(risk_tolerance):
+    return RISK_RETURNS_COLUMN.get(risk_tolerance, "returns_5yr")
+
+
+# Savings rate in percent for one profile or whole arrays of profiles
+def savings_rate(income, savings):
+    income = np.asarray(income, dtype=float)
+    savings = np.asarray(savings, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(income != 0, savings / income * 100, 0.0)
+    return rate if rate.ndim else float(rate)
+
+
+# Built once per loaded dataset so reruns only do lookups:
+# - positions: row positions of the dataset partitioned by risk_level
+# - years / year_codes: categorical-coded Year for every row
+# - mean_returns / cumulative: (risk level, returns column, year) arrays, NaN where
+#   a risk level has no rows in a year
+# - tables: the same numbers as DataFrames, one per (risk_level, returns column)
+class GrowthIndex:
+    def __init__(self, dataset):
+        risk = pd.Categorical(dataset["risk_level"])
+        risk_codes = risk.codes
+        self.levels = list(risk.categories)
+        self.positions = {
+            level: np.flatnonzero(risk_codes == code)
+            for code, level in enumerate(self.levels)
+        }
+
+        year = pd.Categorical(dataset["Year"])
+        self.years = year.categories.to_numpy()
+        self.year_codes = year.codes
+
+        shape = (len(self.levels), len(RETURNS_COLUMNS), len(self.years))
+        self.mean_returns = np.full(shape, np.nan)
+        self.cumulative = np.full(shape, np.nan)
+        self.tables = {}
+
+        returns = {column: dataset[column].to_numpy(dtype=float) for column in RETURNS_COLUMNS}
+        for level_code, level in enumerate(self.levels):
+            positions = self.positions[level]
+            codes = self.year_codes[positions]
+            for column_code, returns_column in enumerate(RETURNS_COLUMNS):
+                values = returns[returns_column][positions]
+
+                # Same result as groupby('Year').mean() followed by cumprod, using bincount on the year codes
+                valid = ~np.isnan(values) & (codes >= 0)
+                sums = np.bincount(codes[valid], weights=values[valid], minlength=len(self.years))
+                counts = np.bincount(codes[valid], minlength=len(self.years))
+                observed = counts > 0
+
+                mean_returns = sums[observed] / counts[observed]
+                cumulative_return = np.cumprod(1 + mean_returns / 100) - 1
+                self.mean_returns[level_code, column_code, observed] = mean_returns
+                self.cumulative[level_code, column_code, observed] = cumulative_return
+
+                yearly_data = pd.DataFrame({
+                    'Year': self.years[observed],
+                    returns_column: mean_returns,
+                })
+                yearly_data['cumulative_return'] = cumulative_return
+                self.tables[(level, returns_column)] = yearly_data
+
+        # Read-only so arrays handed out by the batch APIs cannot corrupt the shared index
+        self.mean_returns.flags.writeable = False
+        self.cumulative.flags.writeable = False
+
+    def rows(self, risk_level):
+        return self.positions.get(risk_level, np.empty(0, dtype=np.intp))
+
+    # Returns the shared precomputed table, callers must not modify it
+    def growth(self, risk_level, returns_column=None):
+        if returns_column is None:
+            returns_column = returns_column_for(risk_level)
+        return self.tables.get((risk_level, returns_column))
+
+    # Integer codes into the index arrays; unknown risk levels map to -1
+    def level_codes(self, risk_levels):
+        return pd.Index(self.levels).get_indexer(np.asarray(risk_levels, dtype=object))
+
+    # Cumulative growth per year for many (risk level, returns column) pairs at once.
+    # Returns an array of shape (n, len(self.years)); rows for unknown risk levels are all NaN.
+    # returns_columns defaults to each risk level's own horizon.
+    def batch_growth(self, risk_levels, returns_columns=None):
+        risk_levels = np.asarray(risk_levels, dtype=object)
+        if returns_columns is None:
+            returns_columns = [returns_column_for(level) for level in risk_levels]
+        column_codes = np.array([RETURNS_COLUMNS.index(column) for column in returns_columns], dtype=np.intp)
+        column_codes = np.broadcast_to(column_codes, risk_levels.shape)
+
+        level_codes = self.level_codes(risk_levels)
+        growth = self.cumulative[np.maximum(level_codes, 0), column_codes]
+        growth[level_codes < 0] = np.nan
+        return growth
+
+    # Latest cumulative growth for each pair, i.e. the last observed year of batch_growth
+    def batch_total_growth(self, risk_levels, returns_columns=None):
+        growth = self.batch_growth(risk_levels, returns_columns)
+        observed = ~np.isnan(growth)
+        last = growth.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+        total = growth[np.arange(len(growth)), last]
+        total[~observed.any(axis=1)] = np.nan
+        return total
+
+
+# Batch version of investment_advisor.process_financial_data for arrays of client profiles.
+# Returns a dict of arrays aligned with the inputs.
+def process_profiles(growth_index, income, expenditure, savings, risk_levels):
+    risk_levels = np.asarray(risk_levels, dtype=object)
+    returns_columns = np.array([returns_column_for(level) for level in risk_levels], dtype=object)
+    return {
+        "savings_rate": savings_rate(income, savings),
+        "surplus": np.asarray(income, dtype=float) - np.asarray(expenditure, dtype=float),
+        "returns_column": returns_columns,
+        "total_growth": growth_index.batch_total_growth(risk_levels, returns_columns),
+    }
@@ -1,8 +1,24 @@
+import json
+import os
+import time
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import requests
-from alpha_vantage.timeseries import TimeSeries
+
+from alpha_vantage_client import CACHE_DIR_ENV, AlphaVantageClient, AlphaVantageError, parse_time_series
+from analytics import INVESTMENT_SUGGESTIONS, GrowthIndex, returns_column_for
+from dataset_cache import compact_dataset, load_snapshot
+from downsample import downsample_series, expense_ratio_points, render_mode
+from faq_index import load_faq_index
+from ingest import FUND_COLUMNS, query_partitions
+import instrumentation
+from instrumentation import Profiler, count, observe, span
+from projection import N_PATHS as PROJECTION_PATHS, project_sip
+from recommender import FundUniverse, recommend_batch, recommendations_frame
+from t5_server import T5Client, T5Generator
+from watchlist import SeriesStore, refresh_watchlist_sync
 
 # Set the background color and font color for all text, including input box labels and dropdowns
 st.markdown(
@@ -30,142 +46,295 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# Load dataset (you can customize this to load a dataset path dynamically)
-@st.cache_data
-def load_dataset(file_path):
+# Hidden debug panel, for operators: with ADVISOR_DEBUG_PANEL=1 set on the server, open the
+# page with ?debug=1. The server setting turns on instrumentation for the whole process (like
+# ADVISOR_INSTRUMENTATION=1); the query parameter only shows the panel and can profile full reruns.
+DEBUG_PANEL = os.environ.get(instrumentation.DEBUG_PANEL_ENV, "").lower() in ("1", "true", "yes")
+if DEBUG_PANEL:
+    instrumentation.enable()
+DEBUG = DEBUG_PANEL and st.query_params.get("debug") == "1"
+
+def format_labels(labels):
+    return ", ".join(f"{name}={value}" for name, value in labels.items())
+
+# Metrics of this server process and, if enabled, the profile of this rerun. Shown at the end
+# of every full rerun, including one where a section raised; fragment reruns do not show it.
+def debug_panel(rerun_seconds, profile_report):
+    with st.expander("Debug: performance"):
+        st.write(f"This rerun took {rerun_seconds * 1000:.1f} ms")
+        data = instrumentation.snapshot()
+        spans_tab, counters_tab, export_tab, profile_tab = st.tabs(["Spans", "Counters", "Export", "Profile"])
+
+        with spans_tab:
+            if data["summaries"]:
+                summaries = pd.DataFrame(data["summaries"])
+                summaries["labels"] = summaries["labels"].map(format_labels)
+                summaries["p95"] = summaries["quantiles"].map(lambda quantiles: quantiles["0.95"])
+                st.dataframe(summaries[["name", "labels", "count", "mean", "p95", "max", "last"]], hide_index=True)
+            else:
+                st.write("Nothing recorded yet.")
+
+        with counters_tab:
+            if data["counters"]:
+                counters = pd.DataFrame(data["counters"])
+                counters["labels"] = counters["labels"].map(format_labels)
+                st.dataframe(counters, hide_index=True)
+            else:
+                st.write("Nothing recorded yet.")
+
+        with export_tab:
+            prometheus = instrumentation.prometheus_text(data)
+            st.download_button("Download Prometheus text", prometheus, "advisor_metrics.txt")
+            st.download_button("Download JSON", json.dumps(data, indent=2), "advisor_metrics.json")
+            st.code(prometheus, language="text")
+
+        with profile_tab:
+            st.checkbox("Profile every full rerun", key="debug_profile")
+            st.selectbox("Profiler", instrumentation.PROFILERS, key="debug_profiler")
+            error = st.session_state.pop("debug_profile_error", None)
+            if error:
+                st.warning(f"Profiler not started: {error}")
+            if profile_report:
+                st.code(profile_report, language="text")
+
+rerun_started = time.perf_counter()
+profiler = None
+if DEBUG and st.session_state.get("debug_profile"):
     try:
-        dataset = pd.read_excel(file_path)
-    except FileNotFoundError:
-        raise ValueError(f"File not found at {file_path}. Please check the path.")
-    except Exception as e:
-        raise ValueError(f"Error loading dataset: {e}")
-    
-    # Instead of inplace=True, assign the result back to the column
-    dataset['returns_3yr'] = dataset['returns_3yr'].fillna(dataset['returns_3yr'].mean())
-    dataset['PE_ratio'] = dataset['PE_ratio'].fillna(dataset['PE_ratio'].mean())
-    dataset['occupation'] = dataset['occupation'].fillna('Unknown')
-
-    
-    # Ensure Year column exists
-    if 'Year' not in dataset.columns:
-        dataset['Year'] = pd.to_datetime(dataset['Date']).dt.year  # Create Year from Date if missing
-    
-    return dataset
-
-# Load the dataset
-dataset = load_dataset(r"C:\\Users\\Sheid_heda\\Desktop\\Oviya\\Datasets\\FINAL_DATASET.xlsx")
-
-# Title and description
-st.markdown('<h1 style="color:black;">Personal Investment Advice using AI</h1>', unsafe_allow_html=True)
-st.markdown('<h3 style="color:black;">Welcome to the Personal Investment Advisor. Please provide your details below.</h3>', unsafe_allow_html=True)
-
-# User inputs for financial data
-st.markdown('<h5 style="color:black;">Enter your monthly income</h5>', unsafe_allow_html=True)
-income = st.text_input("")
-st.markdown('<h5 style="color:black;">Enter your monthly expenditure</h5>', unsafe_allow_html=True)
-expenditure = st.text_input("", key="expenditure_input")
-st.markdown('<h5 style="color:black;">Enter your monthly savings</h5>', unsafe_allow_html=True)
-savings = st.text_input("", key="savings_input")
-
-
-# Convert to float for calculation (if needed)
-income = float(income) if income else 0
-expenditure = float(expenditure) if expenditure else 0
-savings = float(savings) if savings else 0
-
-# Display financial overview chart: Income vs Expenditure vs Savings
-st.markdown('<h3 style="color:black;">Income vs Expenditure vs Savings</h3>', unsafe_allow_html=True)
-def plot_income_expenditure_savings(income, expenditure, savings):
-    data = {"Category": ["Income", "Expenditure", "Savings"],
-            "Amount": [income, expenditure, savings]}
-    df = pd.DataFrame(data)
-    
-    # Create a bar plot using Plotly for interactive tooltips
-    fig = px.bar(df, x="Category", y="Amount", color="Category", 
-                 labels={"Amount": "Amount", "Category": "Category"},
-                 title="Income vs Expenditure vs Savings")
-    st.plotly_chart(fig)
-
-plot_income_expenditure_savings(income, expenditure, savings)
-
-# Change the color of the "Select your Risk Tolerance Level" label to black
-st.markdown('<h3 style="color:black;">Select Risk Tolerance Level</h3>', unsafe_allow_html=True)
-
-# Display the selectbox with the correct label
-risk_tolerance = st.selectbox("", ["Low", "Medium", "High"])
-
-# Investment suggestions based on risk tolerance
-investment_suggestions = {
-    "Low": """
-    - Fixed Deposits (FDs): Safe with guaranteed returns.
-    - Sovereign Gold Bonds (SGBs):  Safe and tangible, but includes storage costs and risks like theft.
-    - Government Bonds: Lower risk with steady returns.
-    - Public Provident Fund (PPF): Long-term savings with tax benefits.
-    - Savings Accounts: Low return, but liquid and safe.
-    """,
-    "Medium": """
-    - Balanced Mutual Funds: Mix of equity and debt for moderate risk.
-    - Gold Mutual Funds: Subject to gold price volatility and fund management strategies.
-    - Real Estate: Invest in property for steady growth.
-    - Corporate Bonds: Moderate risk with better returns than government bonds.
-    - Index Funds: Diversified equity fund for medium-risk tolerance.
-    """,
-    "High": """
-    - Stocks (Equities): High risk but potential for high returns.
-    - Gold Mining Stocks:  Risk depends on company performance and gold prices.
-    - Equity Mutual Funds: Invest in high-growth sectors for higher returns.
-    - Cryptocurrencies: Highly volatile, suitable for aggressive investors.
-    - Venture Capital: Invest in start-ups or private equity for high risk/reward.
-    """
-}
-
-# Display investment suggestions based on selected risk tolerance
-st.markdown('<h3 style="color:black;">Investment Suggestions Based on Your Risk Tolerancel</h3>', unsafe_allow_html=True)
-
-st.write(f"Based on your selected risk tolerance level ({risk_tolerance}), we suggest the following investment options:")
-st.write(investment_suggestions[risk_tolerance])
-
-# Filter data based on selected risk tolerance level
-filtered_data = dataset[dataset["risk_level"] == risk_tolerance].copy()
-
-# Extract Year from Date
-filtered_data['Year'] = pd.to_datetime(filtered_data['Date']).dt.year
-
-# Investment Growth based on risk tolerance
-def plot_investment_growth(filtered_data, risk_tolerance):
-    # Filter data based on risk tolerance (if not done already)
-    if risk_tolerance == "Low":
-        returns_column = "returns_1yr"
-    elif risk_tolerance == "Medium":
-        returns_column = "returns_3yr"
-    else:  # High risk
-        returns_column = "returns_5yr"
-    
-    # Group by Year and calculate the mean returns
-    yearly_data = filtered_data.groupby('Year').agg({
-        returns_column: 'mean'
-    }).reset_index()
-    
-    # Calculate the cumulative return for the selected risk level
-    yearly_data['cumulative_return'] = (1 + yearly_data[returns_column] / 100).cumprod() - 1
-    
-    # Create a plot with tooltips using Plotly
-    fig = px.line(yearly_data, x='Year', y='cumulative_return', 
-                  title=f'Investment Growth Based on Risk Tolerance: {risk_tolerance}',
-                  labels={"Year": "Year", "cumulative_return": "Cumulative Investment Growth (%)"})
-    fig.update_traces(mode='lines+markers', hoverinfo='x+y')  # Show hover info on points
-    st.plotly_chart(fig)
-
-# Ensure filtered data is passed to the function when plotting
-if filtered_data.empty:
-    st.warning(f"No data available for the selected Risk Tolerance Level: {risk_tolerance}. Please check your dataset.")
-else:
-    plot_investment_growth(filtered_data, risk_tolerance)
-
-# Explanation of the investment growth graph (after displaying the graph)
-st.markdown('<h3 style="color:black;">What Does This Graph represent?</h3>', unsafe_allow_html=True)
-
-st.write(""" 
+        profiler = Profiler(st.session_state.get("debug_profiler", "cprofile")).start()
+    except (ImportError, ValueError) as e:
+        # pyinstrument missing, or another session is being profiled right now
+        st.session_state["debug_profile_error"] = str(e)
+
+# The profiler is stopped and the panel shown even when a section below raises
+try:
+    # With ADVISOR_METRICS_PORT set, Prometheus can scrape http://127.0.0.1:<port>/metrics
+    @st.cache_resource
+    def start_metrics_server():
+        port = os.environ.get(instrumentation.METRICS_PORT_ENV)
+        return instrumentation.serve_metrics(int(port)) if port else None
+
+    if instrumentation.enabled():
+        start_metrics_server()
+
+    # st.plotly_chart, recording how often each chart is shown and (with instrumentation on)
+    # the size of the JSON sent to the browser
+    def plotly_chart(fig, chart):
+        count("figure_requests", figure=chart)
+        if instrumentation.enabled():
+            with span("figure_serialize", figure=chart):
+                observe("plotly_payload_bytes", len(fig.to_json()), figure=chart)
+        st.plotly_chart(fig)
+
+    # Load dataset (you can customize this to load a dataset path dynamically)
+    # The workbook is converted once into a columnar snapshot that every process reuses.
+    # A directory is a partitioned dataset written by ingest.py; only the columns the page uses are read.
+    # The compact frame (categoricals, float32) is one shared object across sessions and reruns
+    # instead of a copy per call, so nothing on the page may modify it.
+    @st.cache_resource
+    def load_dataset(file_path):
+        if os.path.isdir(file_path):
+            return compact_dataset(query_partitions(file_path, columns=FUND_COLUMNS))
+        return load_snapshot(file_path)
+
+    # Risk-level partitions and yearly growth tables, built once per dataset and shared across sessions
+    @st.cache_resource
+    def load_growth_index(file_path):
+        dataset = load_dataset(file_path)
+        with span("aggregate", step="growth_index"):
+            return GrowthIndex(dataset)
+
+    # One row per fund with the scoring matrices used by the recommender
+    @st.cache_resource
+    def load_fund_universe(file_path):
+        dataset = load_dataset(file_path)
+        with span("aggregate", step="fund_universe"):
+            return FundUniverse(dataset)
+
+    # Load the dataset
+    DATASET_PATH = os.environ.get("FINAL_DATASET_PATH", r"C:\\Users\\Sheid_heda\\Desktop\\Oviya\\Datasets\\FINAL_DATASET.xlsx")
+    dataset = load_dataset(DATASET_PATH)
+    growth_index = load_growth_index(DATASET_PATH)
+    fund_universe = load_fund_universe(DATASET_PATH)
+
+    # Figures are cached by their inputs and shared across sessions, so a rerun that does not
+    # change a chart's inputs reuses the figure instead of rebuilding it
+    FIGURE_CACHE_ENTRIES = 256
+
+    @st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+    def income_expenditure_savings_figure(income, expenditure, savings):
+        count("figure_cache_misses", figure="income")
+        data = {"Category": ["Income", "Expenditure", "Savings"],
+                "Amount": [income, expenditure, savings]}
+        df = pd.DataFrame(data)
+        
+        # Create a bar plot using Plotly for interactive tooltips
+        with span("figure_build", figure="income"):
+            return px.bar(df, x="Category", y="Amount", color="Category", 
+                          labels={"Amount": "Amount", "Category": "Category"},
+                          title="Income vs Expenditure vs Savings")
+
+    @st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+    def investment_growth_figure(risk_tolerance):
+        count("figure_cache_misses", figure="growth")
+        # Yearly growth tables are precomputed per risk level, so this is only a lookup
+        with span("filter", step="growth_lookup"):
+            yearly_data = growth_index.growth(risk_tolerance)
+        if yearly_data is None or yearly_data.empty:
+            return None
+
+        # Create a plot with tooltips using Plotly
+        with span("figure_build", figure="growth"):
+            fig = px.line(yearly_data, x='Year', y='cumulative_return', 
+                          title=f'Investment Growth Based on Risk Tolerance: {risk_tolerance}',
+                          labels={"Year": "Year", "cumulative_return": "Cumulative Investment Growth (%)"})
+            fig.update_traces(mode='lines+markers', hoverinfo='x+y')  # Show hover info on points
+        return fig
+
+    @st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+    def expense_ratio_figure(return_period, chart_type):
+        count("figure_cache_misses", figure="expense_ratio")
+        if return_period == "1 Year":
+            returns_column = "returns_1yr"
+        elif return_period == "3 Year":
+            returns_column = "returns_3yr"
+        else:
+            returns_column = "returns_5yr"
+
+        # One point per fund, binned further if the universe exceeds the point budget
+        with span("filter", step="expense_ratio_points"):
+            points = expense_ratio_points(dataset, returns_column, chart_type)
+
+        with span("figure_build", figure="expense_ratio"):
+            if chart_type == "Bar Chart":
+                # Use Plotly bar chart for interactivity (mean return per expense ratio)
+                return px.bar(points, x="expense_ratio", y=returns_column, hover_data=["count"],
+                              labels={"expense_ratio": "Expense Ratio", returns_column: f"Returns ({return_period})"},
+                              title=f"Expense Ratio vs {return_period} Returns")
+            else:
+                # Use Plotly scatter plot for interactivity, WebGL once there are many points
+                return px.scatter(points, x="expense_ratio", y=returns_column, hover_data=["count"],
+                                  labels={"expense_ratio": "Expense Ratio", returns_column: f"Returns ({return_period})"},
+                                  title=f"Expense Ratio vs {return_period} Returns",
+                                  render_mode=render_mode(len(points)))
+
+    @st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+    def sip_projection_figure(savings, risk_tolerance, fund_positions):
+        count("figure_cache_misses", figure="projection")
+        funds = fund_universe.funds.iloc[list(fund_positions)]
+        with span("aggregate", step="project_sip"):
+            bands = project_sip(funds, savings, returns_column_for(risk_tolerance))
+        percentiles = [column for column in bands.columns if column.startswith("p")]
+        with span("figure_build", figure="projection"):
+            return px.line(bands, x="Year", y=["contributed"] + percentiles,
+                           labels={"value": "Portfolio Value", "variable": "Percentile"},
+                           title=f"Projected Value of Investing {savings:,.0f} per Month ({PROJECTION_PATHS:,} simulations)")
+
+    # One client per server process: pooled connections, TTL cache, rate limiting and request
+    # coalescing are shared by every session. Set ALPHAVANTAGE_API_KEY to your Alpha Vantage API key.
+    @st.cache_resource
+    def get_alpha_vantage_client():
+        cache_dir = os.environ.get(CACHE_DIR_ENV) or os.path.join(".cache", "alpha_vantage")
+        return AlphaVantageClient(cache_dir=cache_dir, rate_limit_timeout=0)
+
+    def get_stock_data(stock_symbol):
+        try:
+            data = get_alpha_vantage_client().get("TIME_SERIES_DAILY", stock_symbol)
+        except (AlphaVantageError, requests.RequestException):
+            return None
+
+        if 'Time Series (Daily)' in data:
+            # Typed OHLCV columns, oldest first
+            with span("parse", source="alpha_vantage"):
+                return parse_time_series(data).reset_index()
+        else:
+            return None
+
+    # Stock table and figure per symbol. Failures raise LookupError so they are not cached;
+    # successful entries expire after STOCK_CHART_TTL seconds and the client cache decides
+    # whether that means a new request.
+    STOCK_CHART_TTL = 900
+
+    @st.cache_resource(ttl=STOCK_CHART_TTL, max_entries=FIGURE_CACHE_ENTRIES)
+    def stock_chart(stock_symbol):
+        count("figure_cache_misses", figure="stock")
+        stock_data = get_stock_data(stock_symbol)
+        if stock_data is None:
+            raise LookupError(stock_symbol)
+
+        # Plot stock data, reduced to the point budget with LTTB
+        with span("filter", step="downsample"):
+            chart_data = downsample_series(stock_data, 'Date', 'close')
+        with span("figure_build", figure="stock"):
+            fig = px.line(chart_data, x='Date', y='close', title=f'{stock_symbol} Stock Price Over Time',
+                          render_mode=render_mode(len(chart_data)))
+        return stock_data, fig
+
+    # Title and description
+    st.markdown('<h1 style="color:black;">Personal Investment Advice using AI</h1>', unsafe_allow_html=True)
+    st.markdown('<h3 style="color:black;">Welcome to the Personal Investment Advisor. Please provide your details below.</h3>', unsafe_allow_html=True)
+
+    # Each section below is a fragment: interacting with one of its widgets reruns only that
+    # section. The financial inputs are in a form, so typing does not rerun anything until submit.
+    @st.fragment
+    def financial_profile_section():
+        # User inputs for financial data
+        with st.form("financial_details"):
+            st.markdown('<h5 style="color:black;">Enter your monthly income</h5>', unsafe_allow_html=True)
+            income = st.text_input("")
+            st.markdown('<h5 style="color:black;">Enter your monthly expenditure</h5>', unsafe_allow_html=True)
+            expenditure = st.text_input("", key="expenditure_input")
+            st.markdown('<h5 style="color:black;">Enter your monthly savings</h5>', unsafe_allow_html=True)
+            savings = st.text_input("", key="savings_input")
+            st.form_submit_button("Update")
+
+        # Convert to float for calculation (if needed)
+        income = float(income) if income else 0
+        expenditure = float(expenditure) if expenditure else 0
+        savings = float(savings) if savings else 0
+
+        # Display financial overview chart: Income vs Expenditure vs Savings
+        st.markdown('<h3 style="color:black;">Income vs Expenditure vs Savings</h3>', unsafe_allow_html=True)
+        plotly_chart(income_expenditure_savings_figure(income, expenditure, savings), "income")
+
+        # Change the color of the "Select your Risk Tolerance Level" label to black
+        st.markdown('<h3 style="color:black;">Select Risk Tolerance Level</h3>', unsafe_allow_html=True)
+
+        # Display the selectbox with the correct label
+        risk_tolerance = st.selectbox("", ["Low", "Medium", "High"])
+
+        # Display investment suggestions based on selected risk tolerance
+        st.markdown('<h3 style="color:black;">Investment Suggestions Based on Your Risk Tolerancel</h3>', unsafe_allow_html=True)
+
+        st.write(f"Based on your selected risk tolerance level ({risk_tolerance}), we suggest the following investment options:")
+        st.write(INVESTMENT_SUGGESTIONS[risk_tolerance])
+
+        # Rank the funds in the dataset for this profile (a batch of one)
+        if savings > 0 or income > expenditure:
+            with span("aggregate", step="recommend"):
+                fund_index, fund_scores = recommend_batch(fund_universe, [income], [expenditure], [savings], [risk_tolerance])
+            top_funds = recommendations_frame(fund_universe, fund_index, fund_scores)
+            if not top_funds.empty:
+                st.write("Top funds from our dataset that fit your savings and risk tolerance:")
+                st.dataframe(top_funds.drop(columns=["profile"]), hide_index=True)
+
+                # Forward projection of the monthly savings invested equally in these funds
+                if savings > 0:
+                    plotly_chart(sip_projection_figure(savings, risk_tolerance, tuple(fund_index[0][fund_index[0] >= 0])), "projection")
+
+        # Investment Growth based on risk tolerance
+        fig = investment_growth_figure(risk_tolerance)
+        if fig is None:
+            st.warning(f"No data available for the selected Risk Tolerance Level: {risk_tolerance}. Please check your dataset.")
+        else:
+            plotly_chart(fig, "growth")
+
+    financial_profile_section()
+
+    # Explanation of the investment growth graph (after displaying the graph)
+    st.markdown('<h3 style="color:black;">What Does This Graph represent?</h3>', unsafe_allow_html=True)
+
+    st.write(""" 
 The graph above represents the *cumulative investment growth* based on your selected *Risk Tolerance* level. Here's how to interpret it:
 
 - *X-axis (Year)*: Represents the time period over which the investment growth is tracked.
@@ -179,118 +348,175 @@ For example:
 By analyzing this graph, you can visualize the effect of your chosen investment strategy over time.
 """)
 
-# Expense Ratio vs Returns Analysis
-st.markdown('<h3 style="color:black;">Expense Ratio VS Returns</h3>', unsafe_allow_html=True)
-st.markdown('<p style="color:black; font-size:16px;">Select the Return Period:</p>', unsafe_allow_html=True)
-
-return_period = st.selectbox("", ["1 Year", "3 Year", "5 Year"])
-
-# Add a styled label for the chart type selection
-st.markdown('<p style="color:black; font-size:16px;">Select the chart type for Expense Ratio vs Returns:</p>', unsafe_allow_html=True)
-
-chart_type = st.selectbox("", ["Bar Chart", "Scatter Plot"])
-
-def plot_expense_ratio_vs_returns(return_period):
-    if return_period == "1 Year":
-        returns_column = "returns_1yr"
-    elif return_period == "3 Year":
-        returns_column = "returns_3yr"
-    else:
-        returns_column = "returns_5yr"
-
-    if chart_type == "Bar Chart":
-        # Use Plotly bar chart for interactivity
-        fig = px.bar(dataset, x="expense_ratio", y=returns_column,
-                     labels={"expense_ratio": "Expense Ratio", returns_column: f"Returns ({return_period})"},
-                     title=f"Expense Ratio vs {return_period} Returns")
-        st.plotly_chart(fig)
-    elif chart_type == "Scatter Plot":
-        # Use Plotly scatter plot for interactivity
-        fig = px.scatter(dataset, x="expense_ratio", y=returns_column,
-                         labels={"expense_ratio": "Expense Ratio", returns_column: f"Returns ({return_period})"},
-                         title=f"Expense Ratio vs {return_period} Returns")
-        st.plotly_chart(fig)
-
-plot_expense_ratio_vs_returns(return_period)
-
-
-# Alpha Vantage stock data integration
-st.markdown('<h3 style="color:black;">Stock Data From ALpha Vantage</h3>', unsafe_allow_html=True)
-
-# Change the color of the "Enter stock symbol" label to black
-st.markdown('<h6 style="color:black;">Enter stock symbol (e.g., AAPL, MSFT, TSLA)</h6>', unsafe_allow_html=True)
-
-# Display the text input for the stock symbol with a unique key
-stock_symbol = st.text_input("", key="stock_symbol_input")
-
-
-def get_stock_data(stock_symbol):
-    api_key = 'your_alpha_vantage_api_key'  # Replace with your Alpha Vantage API key
-    url = f"https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol={stock_symbol}&apikey={api_key}"
-    response = requests.get(url)
-    data = response.json()
-    
-    if 'Time Series (Daily)' in data:
-        time_series = data['Time Series (Daily)']
-        dates = list(time_series.keys())
-        closing_prices = [float(time_series[date]['4. close']) for date in dates]
-        return pd.DataFrame({'Date': dates, 'Close': closing_prices})
-    else:
-        return None
-
-if stock_symbol:
-    stock_data = get_stock_data(stock_symbol)
-    if stock_data is not None:
-        st.write(f"Stock data for {stock_symbol}:")
-        st.dataframe(stock_data)
-        # Plot stock data
-        fig = px.line(stock_data, x='Date', y='Close', title=f'{stock_symbol} Stock Price Over Time')
-        st.plotly_chart(fig)
-    else:
-        st.warning("Could not retrieve stock data. Please check the symbol or try again later.")
-        
-# Frequently Asked Questions (FAQs) Section
-st.markdown('<h3 style="color:black;">Frequently Asked Questions (FAQs)</h3>', unsafe_allow_html=True)
-
-faqs = {
-    "What is a mutual fund?": "A mutual fund is a pool of funds collected from investors to invest in securities like stocks and bonds.",
-    "What are safe investment options?": "Safe options include Fixed Deposits, Government Bonds, and PPF.",
-    "How to invest in high-risk options?": "High-risk options include Stocks, Cryptocurrencies, and Venture Capital investments.",
-    "How can I increase my savings?": "You can increase savings by reducing unnecessary expenses, budgeting, and automating savings.",
-    "What is SIP?": "A Systematic Investment Plan (SIP) allows you to invest a fixed amount regularly in a mutual fund scheme.",
-    "What is risk tolerance?": "Risk tolerance is the level of risk you are willing to take in your investments, based on your financial goals and stability.",
-    "How do I diversify my portfolio?": "Diversification can be achieved by investing in a mix of assets like stocks, bonds, and real estate to reduce risk.",
-    "What are the tax benefits of investing?": "Investments like PPF, ELSS, and NPS provide tax benefits under Section 80C of the Income Tax Act.",
-    "What is equity?": "Equity refers to ownership in a company, usually through stocks or shares. Investors in equity participate in the company’s growth and profits.",
-    "How to choose the right loan?": "When choosing a loan, consider factors like the interest rate, loan term, repayment schedule, and your ability to repay.",
-    "How to create a financial plan?": "A financial plan involves setting goals, assessing your current financial situation, and creating strategies for saving, investing, and managing debt.",
-    "What is liquidity?": "Liquidity refers to how easily an asset can be converted into cash without affecting its price. Cash is the most liquid asset.",
-    "How do I calculate returns on investment (ROI)?": "ROI is calculated as: (Current Value of Investment - Initial Investment) / Initial Investment * 100.",
-}
-
-# Use multiselect to display questions
-st.markdown('<h5 style="color:black;">Select a question to view the answer:</h5>', unsafe_allow_html=True)
-
-# The selectbox with black text for the placeholder
-faq_question = st.selectbox(
-    "", 
-    ["-- Select a question --"] + list(faqs.keys())
-)
-
-# Only display the answer if a question is selected
-if faq_question != "-- Select a question --":
-    st.write(f"Answer: {faqs[faq_question]}")
-
-
-
-# User feedback for the investment advice system
-st.markdown('<h3 style="color:black;">User feedback</h3>', unsafe_allow_html=True)
-
-# Change the color of the "Provide your feedback for improvement:" label to black
-st.markdown('<h4 style="color:black;">Provide your feedback for improvement:</h4>', unsafe_allow_html=True)
+    # Expense Ratio vs Returns Analysis
+    st.markdown('<h3 style="color:black;">Expense Ratio VS Returns</h3>', unsafe_allow_html=True)
+
+    @st.fragment
+    def expense_ratio_section():
+        st.markdown('<p style="color:black; font-size:16px;">Select the Return Period:</p>', unsafe_allow_html=True)
+
+        return_period = st.selectbox("", ["1 Year", "3 Year", "5 Year"])
+
+        # Add a styled label for the chart type selection
+        st.markdown('<p style="color:black; font-size:16px;">Select the chart type for Expense Ratio vs Returns:</p>', unsafe_allow_html=True)
+
+        chart_type = st.selectbox("", ["Bar Chart", "Scatter Plot"])
+
+        plotly_chart(expense_ratio_figure(return_period, chart_type), "expense_ratio")
+
+    expense_ratio_section()
+
+
+    # Alpha Vantage stock data integration
+    st.markdown('<h3 style="color:black;">Stock Data From ALpha Vantage</h3>', unsafe_allow_html=True)
+
+    @st.fragment
+    def stock_section():
+        # Change the color of the "Enter stock symbol" label to black
+        st.markdown('<h6 style="color:black;">Enter stock symbol (e.g., AAPL, MSFT, TSLA)</h6>', unsafe_allow_html=True)
+
+        # Display the text input for the stock symbol with a unique key
+        stock_symbol = st.text_input("", key="stock_symbol_input")
+
+        if stock_symbol:
+            try:
+                stock_data, fig = stock_chart(stock_symbol)
+            except LookupError:
+                st.warning("Could not retrieve stock data. Please check the symbol or try again later.")
+            else:
+                st.write(f"Stock data for {stock_symbol}:")
+                st.dataframe(stock_data)
+                plotly_chart(fig, "stock")
+
+    stock_section()
+
+    # Watch-list figure and failed symbols per symbol tuple, so a full-page rerun does not reload
+    # and re-merge every stored series. Entries expire like the stock chart. The refresh waits for
+    # the client's rate limiter, so a long list fills in within one (slow) first run.
+    @st.cache_resource(ttl=STOCK_CHART_TTL, max_entries=FIGURE_CACHE_ENTRIES)
+    def watchlist_chart(symbols):
+        count("figure_cache_misses", figure="watchlist")
+        store = SeriesStore(os.path.join(".cache", "watchlist"))
+        with span("load", source="watchlist"):
+            series, errors = refresh_watchlist_sync(get_alpha_vantage_client(), store, symbols)
+
+        fig = None
+        if series:
+            closes = pd.concat(
+                {symbol: downsample_series(frame.reset_index(), 'Date', 'close') for symbol, frame in series.items()},
+                names=["Symbol"],
+            )
+            closes = closes.reset_index(level="Symbol")
+            fig = px.line(closes, x='Date', y='close', color='Symbol', title='Watch-list Closing Prices',
+                          render_mode=render_mode(len(closes)))
+        return fig, list(errors)
+
+    # Compare several tickers; series are stored locally and only new days are fetched on refresh
+    @st.fragment
+    def watchlist_section():
+        st.markdown('<h6 style="color:black;">Compare a watch-list (comma-separated symbols, e.g. AAPL, MSFT, TSLA)</h6>', unsafe_allow_html=True)
+        watchlist_symbols = st.text_input("", key="watchlist_input")
+
+        if watchlist_symbols:
+            symbols = tuple(dict.fromkeys(symbol.strip().upper() for symbol in watchlist_symbols.split(",") if symbol.strip()))
+            with st.spinner("Refreshing the watch-list; new symbols are limited to 5 per minute..."):
+                fig, errors = watchlist_chart(symbols)
+            if fig is not None:
+                plotly_chart(fig, "watchlist")
+            if errors:
+                st.warning(f"Could not refresh: {', '.join(errors)}. Showing stored data where available; please try again later.")
+                # Failures are not kept, so the next rerun retries them
+                watchlist_chart.clear(symbols)
+
+    watchlist_section()
+            
+    # Frequently Asked Questions (FAQs) Section
+    st.markdown('<h3 style="color:black;">Frequently Asked Questions (FAQs)</h3>', unsafe_allow_html=True)
+
+    faqs = {
+        "What is a mutual fund?": "A mutual fund is a pool of funds collected from investors to invest in securities like stocks and bonds.",
+        "What are safe investment options?": "Safe options include Fixed Deposits, Government Bonds, and PPF.",
+        "How to invest in high-risk options?": "High-risk options include Stocks, Cryptocurrencies, and Venture Capital investments.",
+        "How can I increase my savings?": "You can increase savings by reducing unnecessary expenses, budgeting, and automating savings.",
+        "What is SIP?": "A Systematic Investment Plan (SIP) allows you to invest a fixed amount regularly in a mutual fund scheme.",
+        "What is risk tolerance?": "Risk tolerance is the level of risk you are willing to take in your investments, based on your financial goals and stability.",
+        "How do I diversify my portfolio?": "Diversification can be achieved by investing in a mix of assets like stocks, bonds, and real estate to reduce risk.",
+        "What are the tax benefits of investing?": "Investments like PPF, ELSS, and NPS provide tax benefits under Section 80C of the Income Tax Act.",
+        "What is equity?": "Equity refers to ownership in a company, usually through stocks or shares. Investors in equity participate in the company’s growth and profits.",
+        "How to choose the right loan?": "When choosing a loan, consider factors like the interest rate, loan term, repayment schedule, and your ability to repay.",
+        "How to create a financial plan?": "A financial plan involves setting goals, assessing your current financial situation, and creating strategies for saving, investing, and managing debt.",
+        "What is liquidity?": "Liquidity refers to how easily an asset can be converted into cash without affecting its price. Cash is the most liquid asset.",
+        "How do I calculate returns on investment (ROI)?": "ROI is calculated as: (Current Value of Investment - Initial Investment) / Initial Investment * 100.",
+    }
 
-st.markdown(
-    """
+    # Retrieval index over FINQ&A.csv, built once and stored on disk next to the corpus
+    FAQ_CORPUS_PATH = os.environ.get("FINQA_PATH", r"C:\\Users\\Sheid_heda\\Desktop\\Oviya\\FINQ&A.csv")
+
+    @st.cache_resource
+    def get_faq_index(csv_path):
+        return load_faq_index(csv_path)
+
+    # Fine-tuned T5 used only when the FAQ index has no confident match. Set T5_SERVER_URL to use
+    # a running t5_server.py, or FINETUNED_MODEL_PATH to load the model once in this process.
+    @st.cache_resource
+    def get_answer_generator():
+        server_url = os.environ.get("T5_SERVER_URL")
+        if server_url:
+            return T5Client(server_url).generate
+        model_path = os.environ.get("FINETUNED_MODEL_PATH")
+        if not model_path:
+            return None
+        try:
+            return T5Generator(model_path).generate
+        except ImportError:
+            return None
+
+    @st.fragment
+    def faq_section():
+        # Use multiselect to display questions
+        st.markdown('<h5 style="color:black;">Select a question to view the answer:</h5>', unsafe_allow_html=True)
+
+        # The selectbox with black text for the placeholder
+        faq_question = st.selectbox(
+            "", 
+            ["-- Select a question --"] + list(faqs.keys())
+        )
+
+        # Only display the answer if a question is selected
+        if faq_question != "-- Select a question --":
+            st.write(f"Answer: {faqs[faq_question]}")
+
+        # Free-text questions are answered from the nearest questions in FINQ&A.csv
+        st.markdown('<h5 style="color:black;">Or ask your own question:</h5>', unsafe_allow_html=True)
+        user_question = st.text_input("", key="faq_question_input")
+
+        if user_question:
+            try:
+                with span("faq_answer"):
+                    result = get_faq_index(FAQ_CORPUS_PATH).answer(user_question, generate=get_answer_generator())
+            except requests.RequestException:
+                # Inference server unreachable: fall back to the retrieved matches only
+                result = get_faq_index(FAQ_CORPUS_PATH).answer(user_question)
+            if result["answer"] is not None:
+                st.write(f"Answer: {result['answer']}")
+            else:
+                st.warning("We could not find a confident answer to that question.")
+            related = [match["question"] for match in result["matches"] if match["score"] > 0]
+            if related:
+                st.write("Related questions: " + "; ".join(related))
+
+    faq_section()
+
+
+
+    # User feedback for the investment advice system
+    st.markdown('<h3 style="color:black;">User feedback</h3>', unsafe_allow_html=True)
+
+    # Change the color of the "Provide your feedback for improvement:" label to black
+    st.markdown('<h4 style="color:black;">Provide your feedback for improvement:</h4>', unsafe_allow_html=True)
+
+    st.markdown(
+        """
     <style>
     .stTextArea textarea {
         color: #f0f0f5;
@@ -310,13 +536,23 @@ st.markdown(
     }
       </style>
     """,
-    unsafe_allow_html=True
-)
-
-feedback = st.text_area("")
-
-if st.button("Submit Feedback"):
-    if feedback:
-        st.write("Thank you for your valuable feedback!")
-    else:
-        st.warning("Please provide your feedback before submitting.")
+        unsafe_allow_html=True
+    )
+
+    @st.fragment
+    def feedback_section():
+        feedback = st.text_area("")
+
+        if st.button("Submit Feedback"):
+            if feedback:
+                st.write("Thank you for your valuable feedback!")
+            else:
+                st.warning("Please provide your feedback before submitting.")
+
+    feedback_section()
+finally:
+    profile_report = profiler.stop() if profiler is not None else None
+    if DEBUG:
+        rerun_seconds = time.perf_counter() - rerun_started
+        observe("span_seconds", rerun_seconds, span="rerun")
+        debug_panel(rerun_seconds, profile_report)
@@ -0,0 +1,92 @@
+# Loading the fund dataset and the risk-level growth lookups built on it
+import numpy as np
+import pytest
+
+import investment_advisor
+from analytics import GrowthIndex, process_profiles
+from dataset_cache import _read_snapshot, _write_snapshot, load_snapshot
+from ingest import ingest
+from recommender import FundUniverse, recommend_batch
+
+from conftest import MAX_WORKBOOK_ROWS
+
+
+@pytest.fixture(scope="session")
+def workbook(raw_dataset, tmp_path_factory):
+    path = tmp_path_factory.mktemp("workbook") / "FINAL_DATASET.xlsx"
+    raw_dataset.to_excel(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def snapshot(dataset, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("snapshot") / "dataset.arrow")
+    _write_snapshot(dataset, path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def partitions(raw_dataset, tmp_path_factory):
+    directory = tmp_path_factory.mktemp("partitions")
+    source = directory / "dataset.parquet"
+    raw_dataset.to_parquet(source)
+    root = str(directory / "parts")
+    ingest(str(source), root)
+    return root
+
+
+@pytest.fixture(scope="session")
+def growth_index(dataset):
+    return GrowthIndex(dataset)
+
+
+# First load: parse the workbook, prepare it and write the snapshot
+@pytest.mark.max_rows(MAX_WORKBOOK_ROWS)
+def test_load_workbook(benchmark, workbook, tmp_path):
+    counter = iter(range(10 ** 6))
+
+    def fresh_cache():
+        return (workbook, str(tmp_path / f"cache-{next(counter)}")), {}
+
+    benchmark.pedantic(load_snapshot, setup=fresh_cache, rounds=3)
+
+
+# Every later load: memory-mapped Arrow snapshot
+def test_load_snapshot(benchmark, snapshot):
+    benchmark(_read_snapshot, snapshot)
+
+
+# Partitioned Parquet written by ingest.py, all partitions and one risk level
+def test_load_partitions(benchmark, partitions):
+    benchmark(investment_advisor.load_dataset, partitions)
+
+
+def test_load_partitions_one_risk_level(benchmark, partitions):
+    benchmark(investment_advisor.load_dataset, partitions, risk_levels=["Medium"])
+
+
+# Risk filtering and per-Year growth, built once per dataset
+def test_growth_index_build(benchmark, dataset):
+    benchmark(GrowthIndex, dataset)
+
+
+# What each rerun of the growth chart does
+def test_get_investment_growth(benchmark, growth_index):
+    benchmark(investment_advisor.get_investment_growth, growth_index, "Medium")
+
+
+def test_process_profiles_10k(benchmark, growth_index):
+    rng = np.random.default_rng(0)
+    income = rng.uniform(10_000, 200_000, 10_000)
+    expenditure = income * 0.6
+    risk_levels = rng.choice(["Low", "Medium", "High"], 10_000)
+    benchmark(process_profiles, growth_index, income, expenditure, income - expenditure, risk_levels)
+
+
+def test_recommend_batch_10k(benchmark, dataset):
+    universe = FundUniverse(dataset)
+    rng = np.random.default_rng(0)
+    income = rng.uniform(10_000, 200_000, 10_000)
+    expenditure = income * 0.6
+    risk_levels = rng.choice(["Low", "Medium", "High"], 10_000)
+    benchmark(recommend_batch, universe, income, expenditure, income - expenditure, risk_levels)
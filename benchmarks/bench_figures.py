@@ -0,0 +1,34 @@
+# Expense ratio charts: point reduction, figure construction and the JSON that
+# st.plotly_chart sends to the browser
+import plotly.express as px
+import pytest
+
+from downsample import expense_ratio_points, render_mode
+
+
+# Same construction as app.expense_ratio_figure, which cannot be imported outside Streamlit
+def expense_ratio_figure(dataset, returns_column, chart_type):
+    points = expense_ratio_points(dataset, returns_column, chart_type)
+    labels = {"expense_ratio": "Expense Ratio", returns_column: "Returns"}
+    if chart_type == "Bar Chart":
+        return px.bar(points, x="expense_ratio", y=returns_column, hover_data=["count"], labels=labels,
+                      title="Expense Ratio vs Returns")
+    return px.scatter(points, x="expense_ratio", y=returns_column, hover_data=["count"], labels=labels,
+                      title="Expense Ratio vs Returns", render_mode=render_mode(len(points)))
+
+
+@pytest.mark.parametrize("chart_type", ["Bar Chart", "Scatter Plot"])
+def test_expense_ratio_points(benchmark, dataset, chart_type):
+    benchmark(expense_ratio_points, dataset, "returns_3yr", chart_type)
+
+
+@pytest.mark.parametrize("chart_type", ["Bar Chart", "Scatter Plot"])
+def test_expense_ratio_figure(benchmark, dataset, chart_type):
+    benchmark(expense_ratio_figure, dataset, "returns_3yr", chart_type)
+
+
+@pytest.mark.parametrize("chart_type", ["Bar Chart", "Scatter Plot"])
+def test_expense_ratio_payload(benchmark, dataset, chart_type):
+    figure = expense_ratio_figure(dataset, "returns_3yr", chart_type)
+    payload = benchmark(figure.to_json)
+    benchmark.extra_info["payload_bytes"] = len(payload)
@@ -0,0 +1,61 @@
+# generate_answer (Untitled-1.py) through T5Generator, with a tiny randomly initialised
+# T5 so the numbers reflect the batching, tokenization and caching overhead rather than
+# the fine-tuned weights. Set BENCH_T5_MODEL to a model directory to benchmark a real
+# model instead; otherwise the tokenizer named by BENCH_T5_TOKENIZER (default t5-small,
+# downloaded once by transformers) is used. Skipped without torch and transformers.
+import itertools
+import os
+
+import pytest
+
+from t5_server import T5Generator
+
+QUESTION = "What are the best investment options for high-risk tolerance?"
+CONTEXT = "High-risk investments include stocks, cryptocurrencies, and equity funds."
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    if os.environ.get("BENCH_T5_MODEL"):
+        return os.environ["BENCH_T5_MODEL"]
+
+    pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    try:
+        tokenizer = transformers.T5Tokenizer.from_pretrained(os.environ.get("BENCH_T5_TOKENIZER", "t5-small"))
+    except (OSError, ValueError) as e:
+        pytest.skip(f"T5 tokenizer unavailable: {e}")
+
+    config = transformers.T5Config(vocab_size=len(tokenizer), d_model=64, d_ff=128, d_kv=16, num_layers=2,
+                                   num_decoder_layers=2, num_heads=4, decoder_start_token_id=tokenizer.pad_token_id)
+    path = str(tmp_path_factory.mktemp("tiny_t5"))
+    transformers.T5ForConditionalGeneration(config).save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def generator(model_path):
+    return T5Generator(model_path)
+
+
+# Every call is a new question, so each one runs the model
+def test_generate_answer(benchmark, generator):
+    counter = itertools.count()
+    benchmark(lambda: generator.generate(f"{QUESTION} ({next(counter)})", CONTEXT))
+
+
+def test_generate_answer_cached(benchmark, generator):
+    generator.generate(QUESTION, CONTEXT)
+    benchmark(generator.generate, QUESTION, CONTEXT)
+
+
+# Sixteen distinct questions at once go through the model as one padded batch
+def test_generate_batch_16(benchmark, generator):
+    counter = itertools.count()
+
+    def batch():
+        start = next(counter) * 16
+        return generator.generate_batch([(f"{QUESTION} ({start + i})", CONTEXT) for i in range(16)])
+
+    benchmark(batch)
@@ -0,0 +1,47 @@
+# get_stock_data: fetching TIME_SERIES_DAILY from a local stub server and parsing it
+import json
+
+import pytest
+
+from alpha_vantage_client import AlphaVantageClient, FixtureServer, parse_time_series
+
+from synthetic import time_series_payload
+
+# Trading days per payload: compact output, about 4 years, and the full 20-year history
+DAYS = [100, 1000, 5000]
+
+
+@pytest.fixture(scope="module")
+def stub_server(tmp_path_factory):
+    fixtures = tmp_path_factory.mktemp("fixtures")
+    for n_days in DAYS:
+        with open(fixtures / f"TIME_SERIES_DAILY_D{n_days}.json", "w", encoding="utf-8") as f:
+            json.dump(time_series_payload(f"D{n_days}", n_days), f)
+    with FixtureServer(str(fixtures)) as server:
+        yield server
+
+
+@pytest.mark.parametrize("n_days", DAYS)
+def test_parse_time_series(benchmark, n_days):
+    payload = time_series_payload("BENCH", n_days)
+    benchmark(parse_time_series, payload)
+
+
+# Uncached request through the client (pooled connection, no rate limiting) plus parsing,
+# i.e. what app.get_stock_data does when the cache has expired
+@pytest.mark.parametrize("n_days", DAYS)
+def test_get_stock_data(benchmark, stub_server, n_days):
+    client = AlphaVantageClient(base_url=stub_server.url, rate_per_minute=10 ** 9)
+
+    def fetch():
+        payload = client.get("TIME_SERIES_DAILY", f"D{n_days}", outputsize="full")
+        return parse_time_series(payload).reset_index()
+
+    benchmark.pedantic(fetch, setup=client.clear_cache, rounds=20, warmup_rounds=1)
+
+
+# Cache hit: what every rerun does until the next market close
+def test_get_stock_data_cached(benchmark, stub_server):
+    client = AlphaVantageClient(base_url=stub_server.url, rate_per_minute=10 ** 9)
+    client.get("TIME_SERIES_DAILY", "D1000", outputsize="full")
+    benchmark(client.get, "TIME_SERIES_DAILY", "D1000", outputsize="full")
@@ -0,0 +1,50 @@
+# Shared fixtures for the benchmarks. Dataset sizes run from 10^3 rows up to
+# BENCH_MAX_ROWS (10^5 unless set), e.g. BENCH_MAX_ROWS=10000000 for the full range;
+# 10^7 rows needs several GB of memory.
+import os
+import sys
+
+import pytest
+
+# The advisor modules live in the repository root, next to this directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import fund_dataset  # noqa: E402
+
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+MAX_ROWS = int(os.environ.get("BENCH_MAX_ROWS", 10 ** 5))
+
+# Workbooks above this size take minutes to write, so only the snapshot and partition
+# loaders run at larger sizes
+MAX_WORKBOOK_ROWS = 10 ** 4
+
+
+def sizes(limit=None):
+    limit = MAX_ROWS if limit is None else min(limit, MAX_ROWS)
+    return [n for n in SIZES if n <= limit]
+
+
+def pytest_generate_tests(metafunc):
+    if "n_rows" in metafunc.fixturenames:
+        marker = metafunc.definition.get_closest_marker("max_rows")
+        limit = marker.args[0] if marker else None
+        metafunc.parametrize("n_rows", sizes(limit), ids=lambda n: f"{n:.0e}".replace("+0", ""), scope="session")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "max_rows(n): only run this benchmark up to n dataset rows")
+
+
+# Raw (unprepared) synthetic dataset, generated once per size per session
+@pytest.fixture(scope="session")
+def raw_dataset(n_rows):
+    return fund_dataset(n_rows)
+
+
+# Prepared and compacted, as load_dataset returns it
+@pytest.fixture(scope="session")
+def dataset(raw_dataset):
+    from dataset_cache import compact_dataset, prepare_dataset
+
+    return compact_dataset(prepare_dataset(raw_dataset.copy()))
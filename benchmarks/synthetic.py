@@ -0,0 +1,111 @@
+# Synthetic data shaped like FINAL_DATASET.xlsx and Alpha Vantage responses, for the
+# benchmarks. Sizes are arbitrary, generation is seeded so every run sees the same data.
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+# Column order of FINAL_DATASET.xlsx
+DATASET_COLUMNS = [
+    "Date", "expenditure", "Income", "age", "gender", "scheme_name", "min_sip", "min_lumpsum",
+    "expense_ratio", "fund_size_cr", "fund_age_yr", "fund_manager", "returns_1yr", "returns_3yr",
+    "returns_5yr", "sortino", "alpha", "sd", "beta", "sharpe", "risk_level_no", "rating", "category",
+    "market cap", "Change", "PE_ratio", "Ticker", "Open", "High", "Low", "Close", "Adj Close", "Volume",
+    "occupation", "trans_type", "trans_amt", "Desired_Savings", "risk_level",
+]
+
+RISK_LEVELS = ["Negligible", "Low", "Medium", "High", "Severe"]
+CATEGORIES = ["Equity", "Debt", "Hybrid", "Solid Gold", "Other"]
+MARKET_CAPS = ["Large Cap", "Mid Cap", "Small Cap"]
+OCCUPATIONS = ["Salaried", "Self-employed", "Business", "Student", "Retired"]
+TRANS_TYPES = ["Credit", "Debit"]
+
+# The workbook has roughly one fund per ten rows
+ROWS_PER_FUND = 10
+
+
+# FINAL_DATASET-shaped frame with n_rows rows and the dtypes pd.read_excel produces.
+# Fund attributes repeat for every row of a fund; returns_3yr, PE_ratio and occupation
+# have a few percent missing values so prepare_dataset has work to do.
+def fund_dataset(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    n_funds = max(50, n_rows // ROWS_PER_FUND)
+    fund = rng.integers(0, n_funds, n_rows)
+
+    risk_no = rng.integers(0, len(RISK_LEVELS), n_funds)
+    sd = rng.uniform(0.5, 25, n_funds)
+    fund_columns = {
+        "scheme_name": np.array([f"Fund {i:07d} Direct Growth" for i in range(n_funds)], dtype=object),
+        "min_sip": rng.choice([100, 500, 1000, 5000], n_funds),
+        "min_lumpsum": rng.choice([100, 1000, 5000, 10000], n_funds),
+        "expense_ratio": rng.uniform(0.05, 2.5, n_funds).round(2),
+        "fund_size_cr": rng.integers(1, 50_000, n_funds),
+        "fund_age_yr": rng.integers(1, 20, n_funds),
+        "fund_manager": np.array([f"Manager {i:05d}" for i in rng.integers(0, max(10, n_funds // 5), n_funds)],
+                                 dtype=object),
+        "returns_1yr": rng.normal(8, 10, n_funds).round(1),
+        "returns_3yr": rng.normal(15, 12, n_funds).round(1),
+        "returns_5yr": rng.normal(14, 10, n_funds).round(1),
+        "sortino": rng.normal(2, 1.5, n_funds).round(2),
+        "alpha": rng.normal(2, 4, n_funds).round(2),
+        "sd": sd.round(2),
+        "beta": rng.uniform(0, 1.5, n_funds).round(2),
+        "sharpe": rng.normal(1.2, 0.8, n_funds).round(2),
+        "risk_level_no": risk_no + 1,
+        "rating": rng.integers(0, 6, n_funds),
+        "category": np.array(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), n_funds)],
+        "market cap": np.array(MARKET_CAPS, dtype=object)[rng.integers(0, len(MARKET_CAPS), n_funds)],
+        "risk_level": np.array(RISK_LEVELS, dtype=object)[risk_no],
+    }
+
+    start = np.datetime64("2013-01-01")
+    close = rng.uniform(20, 3000, n_rows).round(2)
+    income = rng.uniform(10_000, 200_000, n_rows).round(0)
+    columns = {
+        "Date": start + rng.integers(0, 4 * 365, n_rows).astype("timedelta64[D]"),
+        "expenditure": (income * rng.uniform(0.2, 0.9, n_rows)).astype(np.int64),
+        "Income": income,
+        "age": rng.integers(18, 80, n_rows),
+        "gender": np.array(["Male", "Female"], dtype=object)[rng.integers(0, 2, n_rows)],
+        **{name: values[fund] for name, values in fund_columns.items()},
+        "Change": rng.normal(0, 2, n_rows).round(2),
+        "PE_ratio": rng.uniform(5, 60, n_rows).round(2),
+        "Ticker": np.array([f"TK{i:03d}" for i in range(200)], dtype=object)[rng.integers(0, 200, n_rows)],
+        "Open": close * rng.uniform(0.98, 1.02, n_rows),
+        "High": close * 1.03,
+        "Low": close * 0.97,
+        "Close": close,
+        "Adj Close": close,
+        "Volume": rng.integers(1_000, 10_000_000, n_rows),
+        "occupation": np.array(OCCUPATIONS, dtype=object)[rng.integers(0, len(OCCUPATIONS), n_rows)],
+        "trans_type": np.array(TRANS_TYPES, dtype=object)[rng.integers(0, 2, n_rows)],
+        "trans_amt": rng.uniform(100, 50_000, n_rows).round(2),
+        "Desired_Savings": (income * rng.uniform(0.05, 0.4, n_rows)).round(2),
+    }
+    dataset = pd.DataFrame(columns)[DATASET_COLUMNS]
+
+    for column, share in (("returns_3yr", 0.05), ("PE_ratio", 0.05), ("occupation", 0.02)):
+        dataset.loc[rng.random(n_rows) < share, column] = np.nan
+    return dataset
+
+
+# TIME_SERIES_DAILY payload for `symbol` with n_days trading days ending at `end`,
+# newest first and with string values, as the API returns it
+def time_series_payload(symbol, n_days, end=dt.date(2026, 10, 16), seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=end, periods=n_days)[::-1]
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_days)))
+    series = {
+        date.strftime("%Y-%m-%d"): {
+            "1. open": f"{c * 0.995:.4f}",
+            "2. high": f"{c * 1.01:.4f}",
+            "3. low": f"{c * 0.99:.4f}",
+            "4. close": f"{c:.4f}",
+            "5. volume": str(volume),
+        }
+        for date, c, volume in zip(dates, close, rng.integers(100_000, 50_000_000, n_days))
+    }
+    return {
+        "Meta Data": {"1. Information": "Daily Prices (open, high, low, close) and Volumes", "2. Symbol": symbol},
+        "Time Series (Daily)": series,
+    }
@@ -0,0 +1,191 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import count, span
+
+# pyarrow is optional: without it we fall back to parsing the workbook every time
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# Bump this whenever prepare_dataset changes so stale snapshots are not reused
+SNAPSHOT_VERSION = 2
+
+# Snapshots live next to the workbook unless ADVISOR_CACHE_DIR points elsewhere
+CACHE_DIR_ENV = "ADVISOR_CACHE_DIR"
+
+
+# Columns whose missing values are replaced by the column mean
+IMPUTED_COLUMNS = ['returns_3yr', 'PE_ratio']
+
+# In-memory dtype of each FINAL_DATASET column. Repeated labels become categoricals,
+# ratios and returns float32 and small counts narrow ints. Amounts of money, prices and
+# Volume keep their full precision. Columns not listed here are left as loaded.
+DATASET_SCHEMA = {
+    'scheme_name': 'category',
+    'fund_manager': 'category',
+    'category': 'category',
+    'risk_level': 'category',
+    'gender': 'category',
+    'occupation': 'category',
+    'Ticker': 'category',
+    'market cap': 'category',
+    'trans_type': 'category',
+    'expense_ratio': 'float32',
+    'returns_1yr': 'float32',
+    'returns_3yr': 'float32',
+    'returns_5yr': 'float32',
+    'sortino': 'float32',
+    'alpha': 'float32',
+    'sd': 'float32',
+    'beta': 'float32',
+    'sharpe': 'float32',
+    'Change': 'float32',
+    'PE_ratio': 'float32',
+    'age': 'uint8',
+    'rating': 'int8',
+    'risk_level_no': 'int8',
+    'fund_age_yr': 'int16',
+    'Year': 'int16',
+    'min_sip': 'int32',
+    'min_lumpsum': 'int32',
+    'fund_size_cr': 'int32',
+}
+
+
+# Imputation and Year derivation shared by app.py, investment_advisor.py and ingest.py.
+# `means` maps imputed columns to the value to fill with; by default the means of
+# `dataset` itself are used, ingest.py passes means computed over the whole file.
+def prepare_dataset(dataset, means=None):
+    for column in IMPUTED_COLUMNS:
+        if column in dataset.columns:
+            fill = dataset[column].mean() if means is None else means[column]
+            dataset[column] = dataset[column].fillna(fill)
+    if 'occupation' in dataset.columns:
+        dataset['occupation'] = dataset['occupation'].fillna('Unknown')
+
+    # Ensure Year column exists
+    if 'Year' not in dataset.columns:
+        dataset['Year'] = pd.to_datetime(dataset['Date']).dt.year
+
+    return dataset
+
+
+def _fits(values, dtype):
+    info = np.iinfo(dtype)
+    return not values.isna().any() and (values.empty or (values.min() >= info.min and values.max() <= info.max))
+
+
+# Convert the columns named in `schema` to their compact dtype. An integer column is only
+# narrowed when it has no missing values and every value fits; otherwise it is left as is.
+def compact_dataset(dataset, schema=DATASET_SCHEMA):
+    for column, dtype in schema.items():
+        if column not in dataset.columns or dataset[column].dtype == dtype:
+            continue
+        values = dataset[column]
+        if dtype == 'category' or np.issubdtype(np.dtype(dtype), np.floating):
+            dataset[column] = values.astype(dtype)
+        elif pd.api.types.is_numeric_dtype(values) and _fits(values, dtype):
+            dataset[column] = values.astype(dtype)
+    return dataset
+
+
+# Deep memory use per column (bytes) of `before` and `after`, with a total row
+def memory_report(before, after):
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'bytes_before': before.memory_usage(index=False, deep=True),
+        'dtype_after': after.dtypes.astype(str),
+        'bytes_after': after.memory_usage(index=False, deep=True),
+    })
+    report.loc['total'] = ['', report['bytes_before'].sum(), '', report['bytes_after'].sum()]
+    report['saved'] = 1 - report['bytes_after'] / report['bytes_before']
+    return report
+
+
+# The snapshot name is keyed by the workbook's path, size and mtime, so editing
+# the workbook (or bumping SNAPSHOT_VERSION) produces a new snapshot
+def snapshot_path(file_path, cache_dir=None):
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}:{SNAPSHOT_VERSION}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV) or os.path.join(
+            os.path.dirname(os.path.abspath(file_path)), ".cache"
+        )
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{digest}.arrow")
+
+
+def _read_snapshot(path):
+    # Uncompressed Arrow IPC can be memory-mapped instead of read into memory
+    table = feather.read_table(path, memory_map=True)
+    return table.to_pandas()
+
+
+def _write_snapshot(dataset, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Write to a temp file and rename so concurrent processes never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        feather.write_feather(dataset, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# Load the prepared, compacted dataset, converting the workbook into a columnar snapshot on first use
+def load_snapshot(file_path, cache_dir=None):
+    try:
+        path = snapshot_path(file_path, cache_dir)
+    except FileNotFoundError:
+        raise ValueError(f"File not found at {file_path}. Please check the path.")
+
+    if feather is not None and os.path.exists(path):
+        try:
+            with span("load", source="snapshot"):
+                dataset = _read_snapshot(path)
+            count("dataset_cache", result="hit")
+            return dataset
+        except Exception:
+            # A corrupt snapshot is rebuilt from the workbook below
+            pass
+
+    count("dataset_cache", result="miss")
+    try:
+        with span("load", source="workbook"):
+            dataset = pd.read_excel(file_path)
+    except FileNotFoundError:
+        raise ValueError(f"File not found at {file_path}. Please check the path.")
+    except Exception as e:
+        raise ValueError(f"Error loading dataset: {e}")
+
+    with span("aggregate", step="prepare_dataset"):
+        dataset = compact_dataset(prepare_dataset(dataset))
+
+    if feather is not None:
+        try:
+            _write_snapshot(dataset, path)
+        except OSError:
+            # Read-only deployments still work, they just parse the workbook each time
+            pass
+
+    return dataset
+
+
+# Print the per-column memory report for a workbook:  python dataset_cache.py FINAL_DATASET.xlsx
+if __name__ == "__main__":
+    import sys
+
+    loaded = prepare_dataset(pd.read_excel(sys.argv[1]))
+    print(memory_report(loaded, compact_dataset(loaded.copy())).to_string(float_format='{:.1%}'.format))
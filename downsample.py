@@ -0,0 +1,101 @@
+# Server-side reduction of chart data before it is handed to Plotly, so a rerun ships at
+# most a fixed number of points to the browser regardless of dataset size.
+import numpy as np
+import pandas as pd
+
+# Maximum number of points (or bars) sent per trace
+POINT_BUDGET = 2000
+
+# Traces with more points than this are drawn with WebGL (scattergl) instead of SVG
+WEBGL_THRESHOLD = 1000
+
+
+def render_mode(n_points, threshold=WEBGL_THRESHOLD):
+    return "webgl" if n_points > threshold else "svg"
+
+
+# Largest-Triangle-Three-Buckets: positions of n_out points of (x, y) that keep the visual
+# shape of the line. x must be sorted ascending; the first and last points are always kept.
+def lttb(x, y, n_out):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n - 2 interior points split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # Average point of every bucket, used as the third triangle vertex
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    avg_x = np.append(sums_x / sizes, x[-1])
+    avg_y = np.append(sums_y / sizes, y[-1])
+
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        ax, ay = x[previous], y[previous]
+        cx, cy = avg_x[bucket + 1], avg_y[bucket + 1]
+        area = np.abs((ax - cx) * (y[start:stop] - ay) - (ax - x[start:stop]) * (cy - ay))
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+# Rows of a time-ordered frame reduced to point_budget with LTTB on (x, y)
+def downsample_series(frame, x, y, point_budget=POINT_BUDGET):
+    if len(frame) <= point_budget:
+        return frame
+    x_values = frame[x].to_numpy()
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.astype("datetime64[ns]").astype(np.int64)
+    return frame.iloc[lttb(x_values, frame[y].to_numpy(), point_budget)]
+
+
+# Collapse repeated rows of the same fund into one point (mean of x and y)
+def dedup_funds(dataset, x, y, key="scheme_name"):
+    return dataset.groupby(key, observed=True, sort=False)[[x, y]].mean().reset_index()
+
+
+# Mean of y per x bin; the bar chart's x axis is continuous, so one bar per bin rather than
+# one bar per fund row. Bins with no rows are dropped.
+def bin_mean(frame, x, y, bins=POINT_BUDGET):
+    frame = frame[[x, y]].dropna()
+    if frame.empty or frame[x].nunique() <= bins:
+        grouped = frame.groupby(x, sort=True)[y]
+        return grouped.agg(["mean", "size"]).rename(columns={"mean": y, "size": "count"}).reset_index()
+
+    codes = pd.cut(frame[x], bins=bins, labels=False)
+    grouped = frame.groupby(codes, sort=True)
+    result = grouped[[x, y]].mean()
+    result["count"] = grouped.size()
+    return result.reset_index(drop=True)
+
+
+# 2-D binning for scatter plots: one point per occupied (x, y) cell at the cell's mean
+# position, with the number of funds in it. Used when even one point per fund is too many.
+def bin_2d(frame, x, y, point_budget=POINT_BUDGET):
+    frame = frame[[x, y]].dropna()
+    if len(frame) <= point_budget:
+        return frame.assign(count=1)
+
+    side = max(int(np.sqrt(point_budget)), 1)
+    x_codes = pd.cut(frame[x], bins=side, labels=False)
+    y_codes = pd.cut(frame[y], bins=side, labels=False)
+    grouped = frame.groupby([x_codes, y_codes], sort=False)
+    result = grouped[[x, y]].mean()
+    result["count"] = grouped.size()
+    return result.reset_index(drop=True)
+
+
+# Expense ratio vs returns data for either chart type, within the point budget
+def expense_ratio_points(dataset, returns_column, chart_type, point_budget=POINT_BUDGET):
+    funds = dedup_funds(dataset, "expense_ratio", returns_column)
+    if chart_type == "Bar Chart":
+        return bin_mean(funds, "expense_ratio", returns_column, bins=point_budget)
+    return bin_2d(funds, "expense_ratio", returns_column, point_budget)
@@ -0,0 +1,183 @@
+# Retrieval-based answers over the FINQ&A.csv corpus. Questions (and, with lower weight,
+# answers) are embedded as TF-IDF vectors once and stored as a NumPy matrix on disk; a
+# question is answered by the nearest stored questions by cosine similarity, which takes
+# well under a millisecond on CPU. Only NumPy and pandas are needed.
+import hashlib
+import os
+import re
+import tempfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+# Bump this whenever tokenization or weighting changes so stale indexes are rebuilt
+INDEX_VERSION = 1
+
+# Similarity below this is treated as "no good match" and may go to the generative model
+MIN_SCORE = 0.35
+
+# Answer text helps recall but should not outrank a matching question
+ANSWER_WEIGHT = 0.3
+
+STOP_WORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "to", "of", "in", "on", "for", "and",
+    "or", "what", "how", "do", "does", "i", "my", "me", "can", "it", "its", "this", "that",
+    "with", "as", "by", "at", "which", "should", "why", "when", "who", "you", "your",
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    words = []
+    for word in TOKEN_RE.findall(str(text).lower()):
+        if word in STOP_WORDS:
+            continue
+        # Crude plural folding so "funds" matches "fund"
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    # Unigrams plus bigrams, so "mutual fund" scores above "fund" alone
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _term_counts(texts, vocabulary):
+    counts = np.zeros((len(texts), len(vocabulary)), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for term in tokenize(text):
+            column = vocabulary.get(term)
+            if column is not None:
+                counts[row, column] += 1
+    return counts
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1)
+
+
+class FAQIndex:
+    def __init__(self, terms, idf, matrix, questions, answers):
+        self.terms = terms
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+        self.idf = idf
+        self.matrix = matrix
+        self.questions = questions
+        self.answers = answers
+
+    @classmethod
+    def build(cls, questions, answers):
+        questions = np.asarray(questions, dtype=object)
+        answers = np.asarray(answers, dtype=object)
+        terms = sorted({term for text in np.concatenate([questions, answers]) for term in tokenize(text)})
+        vocabulary = {term: i for i, term in enumerate(terms)}
+
+        counts = _term_counts(questions, vocabulary) + ANSWER_WEIGHT * _term_counts(answers, vocabulary)
+        document_frequency = (counts > 0).sum(axis=0)
+        idf = (np.log((1 + len(questions)) / (1 + document_frequency)) + 1).astype(np.float32)
+        matrix = _normalize(np.log1p(counts) * idf).astype(np.float32)
+        return cls(np.array(terms, dtype=object), idf, matrix, questions, answers)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        # Write to a unique temp file and rename so concurrent builders never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    terms=self.terms.astype(str),
+                    idf=self.idf,
+                    matrix=self.matrix,
+                    questions=self.questions.astype(str),
+                    answers=self.answers.astype(str),
+                )
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                data["terms"].astype(object),
+                data["idf"],
+                data["matrix"],
+                data["questions"].astype(object),
+                data["answers"].astype(object),
+            )
+
+    def embed(self, texts):
+        return _normalize(np.log1p(_term_counts(texts, self.vocabulary)) * self.idf)
+
+    # Top-k stored entries for each question: (positions, cosine scores), best first
+    def search(self, questions, k=3):
+        scores = self.embed(questions) @ self.matrix.T
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    # Answer one question. Returns a dict with the answer, where it came from ("faq" or
+    # "generated") and the nearest stored questions with their scores. When the best match
+    # scores below min_score and `generate` is given, it is called as
+    # generate(question, context) with the nearest answers as context.
+    def answer(self, question, k=3, min_score=MIN_SCORE, generate=None):
+        positions, scores = self.search([question], k)
+        positions, scores = positions[0], scores[0]
+        matches = [
+            {"question": self.questions[p], "answer": self.answers[p], "score": float(s)}
+            for p, s in zip(positions, scores)
+        ]
+
+        best = matches[0] if matches else None
+        if best is not None and best["score"] >= min_score:
+            return {"answer": best["answer"], "source": "faq", "matches": matches}
+
+        if generate is not None:
+            context = " ".join(match["answer"] for match in matches)
+            return {"answer": generate(question, context), "source": "generated", "matches": matches}
+
+        return {"answer": None, "source": None, "matches": matches}
+
+
+def read_corpus(csv_path):
+    # Only the first two columns hold data, the rest of the sheet is empty
+    corpus = pd.read_csv(csv_path, usecols=["Question", "Answer"], encoding="utf-8")
+    return corpus.dropna().drop_duplicates("Question")
+
+
+# The index file is keyed by the corpus content, so editing the CSV produces a new index
+def index_path(csv_path, cache_dir=None):
+    digest = hashlib.sha1()
+    with open(csv_path, "rb") as f:
+        digest.update(f.read())
+    digest.update(str(INDEX_VERSION).encode("utf-8"))
+
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), ".cache")
+    return os.path.join(cache_dir, f"faq_index-{digest.hexdigest()[:16]}.npz")
+
+
+# Load the precomputed index for csv_path, building and saving it on first use
+def load_faq_index(csv_path, cache_dir=None):
+    path = index_path(csv_path, cache_dir)
+    if os.path.exists(path):
+        try:
+            return FAQIndex.load(path)
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            # A corrupt or truncated index is rebuilt (and replaced) below
+            pass
+
+    corpus = read_corpus(csv_path)
+    index = FAQIndex.build(corpus["Question"].to_numpy(), corpus["Answer"].to_numpy())
+    try:
+        index.save(path)
+    except OSError:
+        pass
+    return index
@@ -1,46 +1,182 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
 import pandas as pd
-from datasets import Dataset
-from transformers import T5ForConditionalGeneration, T5Tokenizer, Trainer, TrainingArguments
-
-# Load the dataset
-df = pd.read_csv('C:/Users/Sheid_heda/Desktop/Oviya/FINQ&A.csv')
-
-# Prepare the dataset
-data = Dataset.from_pandas(df[['Question', 'Answer']])  # Adjust column names if necessary
-
-# Load pre-trained T5 model and tokenizer
-model_name = "t5-small"  # You can change this to a larger model if needed
-model = T5ForConditionalGeneration.from_pretrained(model_name)
-tokenizer = T5Tokenizer.from_pretrained(model_name)
-
-# Tokenize the dataset
-def tokenize_function(examples):
-    return tokenizer(examples['question'], padding="max_length", truncation=True, max_length=128)
-
-tokenized_datasets = data.map(tokenize_function, batched=True)
-
-# Define the training arguments
-training_args = TrainingArguments(
-    output_dir='./results',          
-    evaluation_strategy="epoch",     
-    learning_rate=2e-5,             
-    per_device_train_batch_size=8,  
-    per_device_eval_batch_size=8,   
-    num_train_epochs=3,            
-    weight_decay=0.01,              
+from datasets import Dataset, load_from_disk
+from transformers import (
+    DataCollatorForSeq2Seq,
+    Seq2SeqTrainer,
+    Seq2SeqTrainingArguments,
+    T5ForConditionalGeneration,
+    T5Tokenizer,
+    TrainerCallback,
 )
 
-# Initialize the Trainer
-trainer = Trainer(
-    model=model,                         
-    args=training_args,                  
-    train_dataset=tokenized_datasets,         
-    eval_dataset=tokenized_datasets,            
-)
+import instrumentation
+from instrumentation import count, span
+
+DATA_PATH = 'C:/Users/Sheid_heda/Desktop/Oviya/FINQ&A.csv'
+OUTPUT_DIR = 'C:/Users/Sheid_heda/Desktop/Oviya/finetuned_model'
+MODEL_NAME = "t5-small"  # You can change this to a larger model if needed
+
+# Inputs and targets are truncated to these lengths but never padded up to them
+MAX_SOURCE_LENGTH = 128
+MAX_TARGET_LENGTH = 128
+
+# Bump this whenever tokenize_function changes so stale caches are not reused
+TOKENIZATION_VERSION = 2
+
+
+def load_corpus(path):
+    # Only the Question and Answer columns hold data
+    df = pd.read_csv(path, usecols=['Question', 'Answer'], encoding='utf-8')
+    return df.dropna().reset_index(drop=True)
+
+
+# Cache key: the tokenizer (name, vocabulary size, special tokens), the truncation
+# lengths and the exact corpus contents
+def tokenization_key(tokenizer, df):
+    digest = hashlib.sha1()
+    digest.update(f"{tokenizer.name_or_path}:{len(tokenizer)}:{tokenizer.all_special_tokens}".encode('utf-8'))
+    digest.update(f"{MAX_SOURCE_LENGTH}:{MAX_TARGET_LENGTH}:{TOKENIZATION_VERSION}".encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df[['Question', 'Answer']], index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def tokenize_function(tokenizer):
+    def tokenize(examples):
+        # Same template as T5Generator._process. The corpus has no context column, so the
+        # context is left empty (the T5Client default); at inference faq_index passes the
+        # nearest stored answers as context, which training does not see.
+        inputs = [f"question: {question} context: " for question in examples['Question']]
+        model_inputs = tokenizer(inputs, truncation=True, max_length=MAX_SOURCE_LENGTH)
+        labels = tokenizer(text_target=examples['Answer'], truncation=True, max_length=MAX_TARGET_LENGTH)
+        model_inputs['labels'] = labels['input_ids']
+        # Used by group_by_length, so the sampler does not have to measure every example again
+        model_inputs['length'] = [len(ids) for ids in model_inputs['input_ids']]
+        return model_inputs
+    return tokenize
+
+
+# Tokenize inputs and targets once; later runs on the same corpus and tokenizer load the
+# Arrow files from cache_dir instead of re-tokenizing
+def load_tokenized(tokenizer, df, cache_dir):
+    path = os.path.join(cache_dir, f"tokenized-{tokenization_key(tokenizer, df)}")
+    if os.path.isdir(path):
+        print(f"Using cached tokenization at {path}")
+        count("tokenization_cache", result="hit")
+        return load_from_disk(path)
+
+    count("tokenization_cache", result="miss")
+    with span("tokenize"):
+        data = Dataset.from_pandas(df[['Question', 'Answer']], preserve_index=False)
+        tokenized = data.map(tokenize_function(tokenizer), batched=True, remove_columns=data.column_names)
+        tokenized.save_to_disk(path)
+    return tokenized
+
+
+# Reports time per epoch and real (non-padding) tokens per second
+class ThroughputCallback(TrainerCallback):
+    def __init__(self, tokens_per_epoch):
+        self.tokens_per_epoch = tokens_per_epoch
+        self.epoch_start = None
+        self.epoch_times = []
+
+    def on_epoch_begin(self, args, state, control, **kwargs):
+        self.epoch_start = time.perf_counter()
+
+    def on_epoch_end(self, args, state, control, **kwargs):
+        elapsed = time.perf_counter() - self.epoch_start
+        self.epoch_times.append(elapsed)
+        instrumentation.observe("span_seconds", elapsed, span="train_epoch")
+        print(f"Epoch {len(self.epoch_times)}: {elapsed:.1f}s, {self.tokens_per_epoch / elapsed:,.0f} tokens/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--cache-dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+    parser.add_argument("--epochs", type=float, default=3)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--gradient-accumulation-steps", type=int, default=1)
+    parser.add_argument("--learning-rate", type=float, default=2e-5)
+    parser.add_argument("--eval-fraction", type=float, default=0.1,
+                        help="share of the corpus held out for evaluation (0 disables evaluation)")
+    parser.add_argument("--metrics-out", help="write timing spans and cache counters to this JSON file")
+    args = parser.parse_args()
+    if args.metrics_out:
+        instrumentation.enable()
+
+    # Load pre-trained T5 model and tokenizer
+    with span("load", source="model"):
+        model = T5ForConditionalGeneration.from_pretrained(args.model)
+        tokenizer = T5Tokenizer.from_pretrained(args.model)
+
+    # Load and tokenize the dataset (cached)
+    with span("load", source="corpus"):
+        df = load_corpus(args.data)
+    tokenized = load_tokenized(tokenizer, df, args.cache_dir)
+
+    train_dataset, eval_dataset = tokenized, None
+    if args.eval_fraction > 0 and len(tokenized) >= 10:
+        split = tokenized.train_test_split(test_size=args.eval_fraction, seed=42)
+        train_dataset, eval_dataset = split['train'], split['test']
+
+    # Pads each batch only to its longest example; label padding is ignored by the loss
+    data_collator = DataCollatorForSeq2Seq(tokenizer, model=model, label_pad_token_id=-100)
+
+    # Define the training arguments
+    training_args = Seq2SeqTrainingArguments(
+        output_dir='./results',
+        eval_strategy="epoch" if eval_dataset is not None else "no",
+        learning_rate=args.learning_rate,
+        per_device_train_batch_size=args.batch_size,
+        per_device_eval_batch_size=args.batch_size,
+        gradient_accumulation_steps=args.gradient_accumulation_steps,
+        num_train_epochs=args.epochs,
+        weight_decay=0.01,
+        # Batches of similar length need little padding
+        train_sampling_strategy="group_by_length",
+        length_column_name='length',
+        save_strategy="no",
+        report_to="none",
+    )
+
+    tokens_per_epoch = sum(train_dataset['length']) + sum(len(labels) for labels in train_dataset['labels'])
+    throughput = ThroughputCallback(tokens_per_epoch)
+
+    # Initialize the Trainer
+    trainer = Seq2SeqTrainer(
+        model=model,
+        args=training_args,
+        train_dataset=train_dataset,
+        eval_dataset=eval_dataset,
+        data_collator=data_collator,
+        callbacks=[throughput],
+    )
+
+    # Fine-tune the model
+    start = time.perf_counter()
+    with span("train"):
+        trainer.train()
+    total = time.perf_counter() - start
+    epochs = len(throughput.epoch_times) or 1
+    print(f"Trained {len(train_dataset)} examples in {total:.1f}s "
+          f"({total / epochs:.1f}s per epoch, {tokens_per_epoch * epochs / total:,.0f} tokens/sec overall)")
+
+    # Save the fine-tuned model
+    model.save_pretrained(args.output_dir)
+    tokenizer.save_pretrained(args.output_dir)
+
+    if args.metrics_out:
+        with open(args.metrics_out, "w", encoding="utf-8") as f:
+            json.dump(instrumentation.snapshot(), f, indent=2)
 
-# Fine-tune the model
-trainer.train()
 
-# Save the fine-tuned model
-model.save_pretrained('C:/Users/Sheid_heda/Desktop/Oviya/finetuned_model')
-tokenizer.save_pretrained('C:/Users/Sheid_heda/Desktop/Oviya/finetuned_model')
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# Investment advice without Streamlit, for batch jobs and advisor_service.py. Client
+# profiles are read in chunks from CSV or JSON Lines and written out as JSON Lines, one
+# advice record per profile, so files of any size stream through in constant memory:
+#
+#     python headless.py profiles.csv --dataset FINAL_DATASET.xlsx > advice.jsonl
+#     python headless.py profiles.jsonl -o advice.jsonl --top-k 3
+#     cat profiles.jsonl | python headless.py - > advice.jsonl
+#
+# Profiles need income, expenditure, savings and risk_tolerance (Low, Medium or High);
+# any other fields (e.g. a client id) are copied into the record unchanged. Every record,
+# here and from advisor_service.py, has the same fields: risk_tolerance, savings_rate,
+# surplus, total_growth, suggestions, growth and top_funds, plus error for an unknown
+# risk tolerance.
+import argparse
+import json
+import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analytics import INVESTMENT_SUGGESTIONS, GrowthIndex, process_profiles
+from investment_advisor import get_investment_suggestions, load_dataset, process_financial_data
+from recommender import FundUniverse, recommend_batch
+
+PROFILE_COLUMNS = ["income", "expenditure", "savings", "risk_tolerance"]
+
+DATASET_ENV = "FINAL_DATASET_PATH"
+DEFAULT_DATASET = "FINAL_DATASET.xlsx"
+
+CHUNK_SIZE = 10_000
+TOP_K = 5
+
+# Reported for, and instead of funds for, profiles with infinite or NaN amounts
+NON_FINITE_ERROR = "income, expenditure and savings must be finite"
+
+# Risk tolerances by lower-case name
+RISK_LEVELS = {level.lower(): level for level in INVESTMENT_SUGGESTIONS}
+
+
+def suggestion_items(risk_tolerance):
+    text = get_investment_suggestions(risk_tolerance)
+    return [line.strip()[2:] for line in text.splitlines() if line.strip().startswith("- ")]
+
+
+# "low" or " High " count as Low and High; anything else is left for the caller to report
+def normalize_risk(value):
+    return RISK_LEVELS.get(str(value).strip().lower(), value)
+
+
+# JSON has no NaN or Infinity
+def _number(value):
+    return None if value is None or not math.isfinite(value) else value
+
+
+# Everything the advice needs, built once from the dataset: the growth index, the fund
+# universe and, per risk level, the suggestions and growth series as plain JSON values.
+# advisor_service.py builds one before forking its workers, so they all share it.
+class Advisor:
+    def __init__(self, dataset, top_k=TOP_K):
+        self.growth_index = GrowthIndex(dataset)
+        self.universe = FundUniverse(dataset)
+        self.top_k = top_k
+        self.fund_names = self.universe.names.tolist()
+
+        levels = list(INVESTMENT_SUGGESTIONS)
+        self.suggestions = {level: suggestion_items(level) for level in levels}
+        self.total_growth = dict(zip(levels, self.growth_index.batch_total_growth(levels).tolist()))
+        self.growth = {}
+        for level in levels:
+            table = self.growth_index.growth(level)
+            self.growth[level] = [] if table is None else [
+                {"year": int(year), "cumulative_return": _number(float(value))}
+                for year, value in zip(table["Year"], table["cumulative_return"])
+            ]
+
+    @classmethod
+    def from_path(cls, file_path, top_k=TOP_K):
+        return cls(load_dataset(file_path), top_k)
+
+    def _top_funds(self, fund_index, fund_scores):
+        return [
+            {"scheme_name": self.fund_names[fund], "score": round(float(score), 4)}
+            for fund, score in zip(fund_index, fund_scores)
+            if fund >= 0
+        ]
+
+    # The advice record shared by advise and advise_batch; fields are added to `record`
+    def _record(self, record, risk_tolerance, rate, surplus, total_growth, fund_index, fund_scores):
+        record.update({
+            "risk_tolerance": risk_tolerance,
+            "savings_rate": _number(rate),
+            "surplus": _number(surplus),
+            "total_growth": _number(total_growth),
+            "suggestions": self.suggestions.get(risk_tolerance, []),
+            "growth": self.growth.get(risk_tolerance, []),
+            "top_funds": self._top_funds(fund_index, fund_scores),
+        })
+        if risk_tolerance not in self.suggestions:
+            record["error"] = get_investment_suggestions(risk_tolerance)
+        return record
+
+    # One profile, as process_financial_data computes it
+    def advise(self, income, expenditure, savings, risk_tolerance):
+        risk_tolerance = normalize_risk(risk_tolerance)
+        rate, _, _ = process_financial_data(self.growth_index, income, expenditure, savings, risk_tolerance)
+        fund_index, fund_scores = recommend_batch(self.universe, [income], [expenditure], [savings],
+                                                  [risk_tolerance], k=self.top_k)
+        return self._record({}, risk_tolerance, rate, income - expenditure,
+                            self.total_growth.get(risk_tolerance, math.nan), fund_index[0], fund_scores[0])
+
+    # Records for a DataFrame of profiles, computed with the batch APIs (process_profiles
+    # and recommend_batch). Extra columns are copied into each record. Profiles with an
+    # infinite amount get NON_FINITE_ERROR and no funds, as advisor_service rejects them.
+    def advise_batch(self, profiles):
+        missing = [column for column in PROFILE_COLUMNS if column not in profiles.columns]
+        if missing:
+            raise ValueError(f"Profiles are missing {', '.join(missing)}")
+
+        # Empty amounts count as 0, like the app's inputs
+        amounts = {
+            column: pd.to_numeric(profiles[column], errors="coerce").fillna(0).to_numpy(dtype=float)
+            for column in ("income", "expenditure", "savings")
+        }
+        risk_levels = profiles["risk_tolerance"].astype(str).map(normalize_risk).to_numpy(dtype=object)
+
+        results = process_profiles(self.growth_index, amounts["income"], amounts["expenditure"],
+                                   amounts["savings"], risk_levels)
+        fund_index, fund_scores = recommend_batch(self.universe, amounts["income"], amounts["expenditure"],
+                                                  amounts["savings"], risk_levels, k=self.top_k)
+
+        extra = [column for column in profiles.columns if column not in PROFILE_COLUMNS]
+        passthrough = (profiles[extra].astype(object).where(profiles[extra].notna(), None).to_dict("records")
+                       if extra else [{} for _ in range(len(profiles))])
+        records = [
+            self._record(passthrough[i], risk_tolerance, rate, surplus, total_growth, fund_index[i], fund_scores[i])
+            for i, (risk_tolerance, rate, surplus, total_growth) in enumerate(zip(
+                risk_levels.tolist(), results["savings_rate"].tolist(), results["surplus"].tolist(),
+                results["total_growth"].tolist(),
+            ))
+        ]
+
+        finite = np.isfinite(amounts["income"]) & np.isfinite(amounts["expenditure"]) & np.isfinite(amounts["savings"])
+        for i in np.flatnonzero(~finite).tolist():
+            records[i]["top_funds"] = []
+            records[i]["error"] = NON_FINITE_ERROR
+        return records
+
+
+# Yield DataFrames of at most chunk_size profiles from a CSV or JSON Lines file ("-" is
+# JSON Lines on stdin)
+def read_profiles(path, chunk_size=CHUNK_SIZE):
+    if path == "-" or os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson", ".json"):
+        source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            batch = []
+            for line in source:
+                if line.strip():
+                    batch.append(json.loads(line))
+                if len(batch) == chunk_size:
+                    yield pd.DataFrame(batch)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        return
+
+    yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Investment advice for a file of client profiles")
+    parser.add_argument("profiles", help="CSV or JSON Lines file of profiles, or - for JSON Lines on stdin")
+    parser.add_argument("-o", "--output", help="JSON Lines output file (default: stdout)")
+    parser.add_argument("--dataset", default=os.environ.get(DATASET_ENV, DEFAULT_DATASET))
+    parser.add_argument("--top-k", type=int, default=TOP_K, help="funds recommended per profile")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    advisor = Advisor.from_path(args.dataset, args.top_k)
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    count = 0
+    try:
+        for profiles in read_profiles(args.profiles, args.chunk_size):
+            output.writelines(
+                json.dumps(record, default=_json_default) + "\n" for record in advisor.advise_batch(profiles)
+            )
+            count += len(profiles)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"Advised {count:,} profiles", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
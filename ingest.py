@@ -0,0 +1,219 @@
+# Streaming ingestion for fund and daily price files too large to load at once.
+#
+#     python ingest.py funds.csv data/funds                 # CSV or Parquet in, Parquet out
+#     python ingest.py prices.parquet data/prices --partition-by Ticker Year
+#
+# The source is read twice in chunks: the first pass accumulates sums and counts for the
+# imputed columns (dataset_cache.IMPUTED_COLUMNS) and the Arrow schema of every chunk; the
+# second pass fills missing values with the whole-file means, derives Year and streams the
+# chunks into a hive-partitioned Parquet dataset (risk_level=High/Year=2015/...). Memory use
+# is bounded by the chunk size, not the file size.
+#
+# query_partitions reads the result back, opening only the partition directories and
+# row groups that can match the filters and only the requested columns.
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from dataset_cache import IMPUTED_COLUMNS, prepare_dataset
+from instrumentation import span
+
+# pyarrow is optional for the rest of the app, but required here
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+CHUNK_SIZE = 500_000
+
+PARTITION_COLUMNS = ["risk_level", "Year"]
+
+# Rows with no value for a partition column go to this partition
+MISSING_PARTITION = "Unknown"
+
+# Written next to the partitions; the leading underscore keeps pyarrow from reading it as data
+MANIFEST_NAME = "_ingest.json"
+
+# Columns the Streamlit app reads (growth index, fund universe, expense ratio chart and
+# SIP projection); the client and price columns stay on disk
+FUND_COLUMNS = [
+    "risk_level", "Year", "scheme_name", "category", "min_sip", "min_lumpsum", "expense_ratio",
+    "returns_1yr", "returns_3yr", "returns_5yr", "sharpe", "sortino", "alpha", "rating", "sd", "beta",
+]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for streaming ingestion (pip install pyarrow)")
+
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+# Yield the source as pandas chunks of at most chunk_size rows
+def iter_chunks(path, chunk_size=CHUNK_SIZE, columns=None):
+    if _is_parquet(path):
+        _require_pyarrow()
+        parquet = pq.ParquetFile(path)
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    header = pd.read_csv(path, nrows=0).columns
+    parse_dates = ["Date"] if "Date" in header and (columns is None or "Date" in columns) else None
+    yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns, parse_dates=parse_dates)
+
+
+# First pass: whole-file means of the imputed columns, row count and one Arrow schema that
+# every prepared chunk can be cast to (an int column with gaps in a later chunk becomes
+# float64, an all-null column in an early chunk takes the type seen later)
+def scan(path, chunk_size=CHUNK_SIZE):
+    _require_pyarrow()
+    sums = {column: 0.0 for column in IMPUTED_COLUMNS}
+    counts = {column: 0 for column in IMPUTED_COLUMNS}
+    rows = 0
+    schema = None
+
+    for chunk in iter_chunks(path, chunk_size):
+        rows += len(chunk)
+        for column in IMPUTED_COLUMNS:
+            if column in chunk.columns:
+                values = pd.to_numeric(chunk[column], errors="coerce")
+                sums[column] += float(values.sum())
+                counts[column] += int(values.count())
+
+        # Schema of the chunk as it will be written (the fill value does not matter here)
+        chunk = prepare_dataset(chunk, dict.fromkeys(IMPUTED_COLUMNS, 0.0))
+        chunk_schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+        schema = chunk_schema if schema is None else pa.unify_schemas(
+            [schema, chunk_schema], promote_options="permissive"
+        )
+
+    means = {column: sums[column] / counts[column] if counts[column] else None for column in IMPUTED_COLUMNS}
+    return {"rows": rows, "means": means, "schema": schema}
+
+
+def _prepared_batches(path, chunk_size, means, schema, partition_by):
+    fill = {column: 0.0 if value is None else value for column, value in means.items()}
+    for chunk in iter_chunks(path, chunk_size):
+        chunk = prepare_dataset(chunk, fill)
+        for column in partition_by:
+            if pd.api.types.is_string_dtype(chunk[column]):
+                chunk[column] = chunk[column].fillna(MISSING_PARTITION)
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        yield from table.select(schema.names).cast(schema).to_batches()
+
+
+# Convert `path` (CSV or Parquet) into a hive-partitioned Parquet dataset at `root`.
+# The new dataset is written beside `root` and swapped in at the end, so readers never see
+# a half-written tree. Returns the manifest (source, rows, means, partition columns).
+def ingest(path, root, chunk_size=CHUNK_SIZE, partition_by=None):
+    _require_pyarrow()
+    summary = scan(path, chunk_size)
+    schema = summary["schema"]
+    if schema is None:
+        raise ValueError(f"{path} contains no rows")
+
+    if partition_by is None:
+        partition_by = [column for column in PARTITION_COLUMNS if column in schema.names]
+    missing = [column for column in partition_by if column not in schema.names]
+    if missing:
+        raise ValueError(f"Partition columns not found in {path}: {', '.join(missing)}")
+
+    # Partition values are strings or years; nullable partitions of other types would
+    # turn into a "__HIVE_DEFAULT_PARTITION__" directory
+    partitioning = ds.partitioning(pa.schema([schema.field(column) for column in partition_by]), flavor="hive")
+
+    parent = os.path.dirname(os.path.abspath(root))
+    os.makedirs(parent, exist_ok=True)
+    tmp_root = tempfile.mkdtemp(dir=parent, prefix=".ingest-")
+    try:
+        ds.write_dataset(
+            _prepared_batches(path, chunk_size, summary["means"], schema, partition_by),
+            tmp_root,
+            schema=schema,
+            format="parquet",
+            partitioning=partitioning,
+            basename_template="part-{i}.parquet",
+            # Row groups are the unit of predicate pushdown inside a partition
+            max_rows_per_group=min(chunk_size, 1_000_000),
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+        manifest = {
+            "source": os.path.abspath(path),
+            "rows": summary["rows"],
+            "means": summary["means"],
+            "partition_by": partition_by,
+        }
+        with open(os.path.join(tmp_root, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        if os.path.exists(root):
+            shutil.rmtree(root)
+        os.replace(tmp_root, root)
+    except Exception:
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        raise
+    return manifest
+
+
+def read_manifest(root):
+    with open(os.path.join(root, MANIFEST_NAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def open_partitions(root):
+    _require_pyarrow()
+    return ds.dataset(root, format="parquet", partitioning="hive")
+
+
+# Read rows of the partitioned dataset at `root` as a pandas DataFrame. risk_levels and
+# years select partitions (whole directories are skipped); `filter` is any further
+# pyarrow.dataset expression, e.g. ds.field("returns_3yr") > 10, checked against Parquet
+# row-group statistics before any data is decoded. Only `columns` are read.
+def query_partitions(root, risk_levels=None, years=None, columns=None, filter=None):
+    dataset = open_partitions(root)
+    expression = filter
+    for column, values in (("risk_level", risk_levels), ("Year", years)):
+        if values is None:
+            continue
+        if np.isscalar(values):
+            values = [values]
+        condition = pc.field(column).isin(list(values))
+        expression = condition if expression is None else expression & condition
+
+    if columns is not None:
+        columns = [column for column in columns if column in dataset.schema.names]
+    with span("load", source="partitions"):
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a large CSV/Parquet file into partitioned Parquet")
+    parser.add_argument("source", help="CSV or Parquet file")
+    parser.add_argument("root", help="output directory (replaced if it exists)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--partition-by", nargs="+", help=f"partition columns (default: {' '.join(PARTITION_COLUMNS)})")
+    args = parser.parse_args()
+
+    manifest = ingest(args.source, args.root, args.chunk_size, args.partition_by)
+    print(f"Wrote {manifest['rows']:,} rows to {args.root} partitioned by {', '.join(manifest['partition_by'])}")
+    for column, mean in manifest["means"].items():
+        if mean is not None:
+            print(f"  {column} imputed with {mean:.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+# Opt-in timing spans, counters and size observations for the advisor, shared by app.py,
+# investment_advisor.py and the T5 scripts. Only the standard library is imported here.
+#
+# Off unless ADVISOR_INSTRUMENTATION=1 is set or enable() is called; while off, span(),
+# count() and observe() record nothing and return immediately.
+#
+#     with span("filter"):
+#         ...
+#     count("dataset_cache", result="hit")
+#     observe("plotly_payload_bytes", len(payload), figure="growth")
+#
+# prometheus_text() and snapshot() export everything recorded in this process;
+# serve_metrics() exposes both over HTTP for a Prometheus scraper.
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLE_ENV = "ADVISOR_INSTRUMENTATION"
+METRICS_PORT_ENV = "ADVISOR_METRICS_PORT"
+# Lets app.py show its ?debug=1 panel; set by the operator, never by a visitor
+DEBUG_PANEL_ENV = "ADVISOR_DEBUG_PANEL"
+
+# Prefix of every exported metric name
+NAMESPACE = "advisor"
+
+# Recent values kept per summary for the quantiles
+SAMPLE_WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+_enabled = os.environ.get(ENABLE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def enabled():
+    return _enabled
+
+
+def enable(flag=True):
+    global _enabled
+    _enabled = bool(flag)
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        # (name, labels) -> [count, sum, max, last, recent values]
+        self._summaries = {}
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = [0, 0.0, value, value, deque(maxlen=SAMPLE_WINDOW)]
+            summary[0] += 1
+            summary[1] += value
+            summary[2] = max(summary[2], value)
+            summary[3] = value
+            summary[4].append(value)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+    # Plain dicts: {"counters": [...], "summaries": [...]}, each entry with name and labels
+    def snapshot(self):
+        with self._lock:
+            counters = list(self._counters.items())
+            summaries = [(key, summary[:4] + [sorted(summary[4])]) for key, summary in self._summaries.items()]
+
+        result = {"counters": [], "summaries": []}
+        for (name, labels), value in sorted(counters):
+            result["counters"].append({"name": name, "labels": dict(labels), "value": value})
+        for (name, labels), (n, total, largest, last, values) in sorted(summaries, key=lambda item: item[0]):
+            result["summaries"].append({
+                "name": name,
+                "labels": dict(labels),
+                "count": n,
+                "sum": total,
+                "mean": total / n,
+                "max": largest,
+                "last": last,
+                "quantiles": {str(q): values[min(len(values) - 1, int(q * len(values)))] for q in QUANTILES},
+            })
+        return result
+
+
+REGISTRY = Registry()
+
+
+def count(name, value=1, **labels):
+    if _enabled:
+        REGISTRY.count(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    if _enabled:
+        REGISTRY.observe(name, value, **labels)
+
+
+# Wall time of the block, recorded as span_seconds{span=name}
+@contextmanager
+def span(name, **labels):
+    if not _enabled:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.observe("span_seconds", time.perf_counter() - started, span=name, **labels)
+
+
+# Decorator form of span
+def timed(name, **labels):
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with span(name, **labels):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def snapshot():
+    return REGISTRY.snapshot()
+
+
+def _labels(labels, extra=None):
+    items = list(labels.items()) + list((extra or {}).items())
+    if not items:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in items)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(items, escaped)) + "}"
+
+
+# Prometheus text exposition format: counters as <name>_total, summaries with quantiles
+def prometheus_text(data=None):
+    data = snapshot() if data is None else data
+    lines = []
+    typed = set()
+    for counter in data["counters"]:
+        name = f"{NAMESPACE}_{counter['name']}_total"
+        if name not in typed:
+            lines.append(f"# TYPE {name} counter")
+            typed.add(name)
+        lines.append(f"{name}{_labels(counter['labels'])} {counter['value']}")
+    for summary in data["summaries"]:
+        name = f"{NAMESPACE}_{summary['name']}"
+        if name not in typed:
+            lines.append(f"# TYPE {name} summary")
+            typed.add(name)
+        for q, value in summary["quantiles"].items():
+            lines.append(f"{name}{_labels(summary['labels'], {'quantile': q})} {value}")
+        lines.append(f"{name}_sum{_labels(summary['labels'])} {summary['sum']}")
+        lines.append(f"{name}_count{_labels(summary['labels'])} {summary['count']}")
+    return "\n".join(lines) + "\n"
+
+
+# Background HTTP endpoint: GET /metrics (Prometheus text) and /metrics.json
+def serve_metrics(port, host="127.0.0.1"):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = prometheus_text().encode("utf-8"), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = json.dumps(snapshot()).encode("utf-8"), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Profiles one block of work (e.g. one Streamlit rerun) with cProfile or, if installed,
+# pyinstrument's sampling profiler. stop() returns the report as text.
+class Profiler:
+    def __init__(self, engine="cprofile", limit=40):
+        if engine not in PROFILERS:
+            raise ValueError(f"Unknown profiler {engine!r}, expected one of {', '.join(PROFILERS)}")
+        self.engine = engine
+        self.limit = limit
+        if engine == "pyinstrument":
+            # Optional dependency, only needed when selected
+            from pyinstrument import Profiler as SamplingProfiler
+            self._profiler = SamplingProfiler()
+        else:
+            self._profiler = cProfile.Profile()
+
+    def start(self):
+        if self.engine == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+        return self
+
+    def stop(self):
+        if self.engine == "pyinstrument":
+            self._profiler.stop()
+            return self._profiler.output_text(unicode=True, color=False)
+        self._profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(self.limit)
+        return out.getvalue()
@@ -0,0 +1,119 @@
+# Load test for advisor_service.py: keeps `concurrency` keep-alive connections busy with
+# POST /advice (or /advice/batch with --batch) for `duration` seconds and reports
+# throughput and latency percentiles.
+#
+#     python advisor_service.py --workers 4 &
+#     python load_test.py --url http://127.0.0.1:8700 --concurrency 64 --duration 20
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+RISK_LEVELS = ["Low", "Medium", "High"]
+
+
+def random_profile(rng):
+    income = round(rng.uniform(10_000, 200_000))
+    return {
+        "income": income,
+        "expenditure": round(income * rng.uniform(0.3, 0.9)),
+        "savings": round(income * rng.uniform(0.05, 0.3)),
+        "risk_tolerance": rng.choice(RISK_LEVELS),
+    }
+
+
+def request_bytes(host, path, payload):
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+# Requests are prepared up front so the client spends its time on I/O
+async def connection(host, port, requests, deadline, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        i = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(requests[i % len(requests)])
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+            i += 1
+    finally:
+        writer.close()
+
+
+async def run(url, concurrency, duration, batch, seed):
+    parsed = urlparse(url)
+    host, port = parsed.hostname, parsed.port or 80
+    rng = random.Random(seed)
+    if batch:
+        path = "/advice/batch"
+        requests = [request_bytes(host, path, {"profiles": [random_profile(rng) for _ in range(batch)]})
+                    for _ in range(64)]
+    else:
+        path = "/advice"
+        requests = [request_bytes(host, path, random_profile(rng)) for _ in range(1024)]
+
+    latencies, statuses = [], {}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        connection(host, port, requests[i::concurrency] or requests, deadline, latencies, statuses)
+        for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    return latencies, statuses, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for advisor_service.py")
+    parser.add_argument("--url", default="http://127.0.0.1:8700")
+    parser.add_argument("--concurrency", type=int, default=64, help="open keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument("--batch", type=int, default=0, help="profiles per /advice/batch request (0: /advice)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    latencies, statuses, elapsed = asyncio.run(run(args.url, args.concurrency, args.duration, args.batch, args.seed))
+    if not latencies:
+        print("No requests completed")
+        return 1
+
+    latencies = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    requests = len(latencies)
+    print(f"{requests:,} requests in {elapsed:.1f}s over {args.concurrency} connections")
+    print(f"throughput: {requests / elapsed:,.0f} requests/sec"
+          + (f", {requests * args.batch / elapsed:,.0f} profiles/sec" if args.batch else ""))
+    print(f"latency ms: p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {latencies.max():.2f}")
+    print("status codes: " + ", ".join(f"{status}: {n:,}" for status, n in sorted(statuses.items())))
+    return 0 if set(statuses) == {200} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# Measures how long the Streamlit page takes to rerun after common interactions, using
+# Streamlit's AppTest harness and the offline Alpha Vantage fixture server.
+#
+#     python measure_reruns.py --fixtures fixtures --baseline HEAD~1
+#
+# --baseline also measures app.py as of that git revision so the numbers can be compared.
+# AppTest always reruns the whole script, so fragment-scoped reruns in the browser are
+# cheaper still: these numbers include every other section of the page.
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from alpha_vantage_client import FixtureServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _submit_form(at):
+    # Current app: financial inputs sit in a form and only apply on submit
+    for button in at.button:
+        if button.label == "Update":
+            button.click()
+
+
+# Each interaction changes one widget; i varies the value so no rerun is a no-op
+INTERACTIONS = {
+    "income": lambda at, i: (at.text_input[0].input(str(1000 + i)), _submit_form(at)),
+    "risk_tolerance": lambda at, i: at.selectbox[0].select(["Low", "Medium", "High"][i % 3]),
+    "return_period": lambda at, i: at.selectbox[1].select(["1 Year", "3 Year", "5 Year"][i % 3]),
+    "chart_type": lambda at, i: at.selectbox[2].select(["Bar Chart", "Scatter Plot"][i % 2]),
+    "stock_symbol": lambda at, i: at.text_input(key="stock_symbol_input").input(["AAPL", "MSFT"][i % 2]),
+}
+
+
+def measure(app_path, symbol, repeat):
+    at = AppTest.from_file(app_path, default_timeout=120).run()
+    if at.exception:
+        raise RuntimeError(f"{app_path} failed: {at.exception[0].value}")
+    at.text_input(key="stock_symbol_input").input(symbol).run()
+
+    results = {}
+    for name, interact in INTERACTIONS.items():
+        timings = []
+        for i in range(repeat):
+            interact(at, i)
+            start = time.perf_counter()
+            at.run()
+            timings.append(time.perf_counter() - start)
+        results[name] = statistics.median(timings) * 1000
+    return results
+
+
+def baseline_app(revision, dataset, base_url):
+    source = subprocess.run(
+        ["git", "show", f"{revision}:app.py"], cwd=HERE, check=True, capture_output=True, text=True
+    ).stdout
+    # Older revisions hardcode the workbook path instead of reading FINAL_DATASET_PATH
+    source = re.sub(r'r"[^"]*FINAL_DATASET\.xlsx"', lambda m: repr(dataset), source)
+    # ... and call alphavantage.co directly instead of ALPHAVANTAGE_BASE_URL
+    source = source.replace("https://www.alphavantage.co/query", base_url)
+    # Written next to app.py so its local imports resolve
+    fd, path = tempfile.mkstemp(prefix="_baseline_app_", suffix=".py", dir=HERE)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(source)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", required=True, help="directory of Alpha Vantage JSON fixtures")
+    parser.add_argument("--dataset", default=os.path.join(HERE, "FINAL_DATASET.xlsx"))
+    parser.add_argument("--faq-corpus", default=os.path.join(HERE, "FINQ&A.csv"))
+    parser.add_argument("--symbol", default="AAPL")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--baseline", help="git revision of app.py to compare against")
+    args = parser.parse_args()
+
+    os.environ["FINAL_DATASET_PATH"] = os.path.abspath(args.dataset)
+    os.environ["FINQA_PATH"] = os.path.abspath(args.faq_corpus)
+    apps = {"current": os.path.join(HERE, "app.py")}
+
+    with FixtureServer(args.fixtures) as server:
+        os.environ["ALPHAVANTAGE_BASE_URL"] = server.url
+        if args.baseline:
+            apps["baseline"] = baseline_app(args.baseline, os.environ["FINAL_DATASET_PATH"], server.url)
+        try:
+            results = {label: measure(path, args.symbol, args.repeat) for label, path in apps.items()}
+        finally:
+            if args.baseline:
+                os.remove(apps["baseline"])
+
+    labels = list(results)
+    print("interaction".ljust(16) + "".join(f"{label:>12}" for label in labels) + "   (median ms per rerun)")
+    for name in INTERACTIONS:
+        print(name.ljust(16) + "".join(f"{results[label][name]:>12.1f}" for label in labels))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# Monte Carlo projection of a monthly SIP (systematic investment plan) into a portfolio of
+# funds from FINAL_DATASET. Only NumPy and pandas are needed.
+#
+# Fund returns follow a single-factor model: each month
+#     r_i = mu_i / 12 + beta_i * m + e_i,   m ~ N(0, market_sd^2 / 12),  e_i ~ N(0, idio_i^2 / 12)
+# where mu_i is the fund's annualised return (returns_* column), and idio_i is the part
+# of its volatility (sd column) not explained by beta_i * market_sd. Funds are therefore
+# correlated through the shared market term. Because everything is normal, a weighted
+# portfolio collapses exactly to one normal draw per month and path:
+#     r_p ~ N(w.mu / 12, ((w.beta)^2 market_sd^2 + sum w_i^2 idio_i^2) / 12)
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Annualised volatility of the market factor, in the same units as the sd column / 100
+MARKET_SD = 0.15
+
+N_PATHS = 100_000
+YEARS = 30
+
+# Paths simulated at a time; each chunk holds a (12, chunk_size) float32 block of draws
+CHUNK_SIZE = 25_000
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# A month cannot lose more than this fraction of the portfolio
+MIN_MONTHLY_RETURN = -0.99
+
+
+# Expected annual return, portfolio beta and idiosyncratic volatility (all as fractions)
+# for `funds` (rows with returns_column, sd and beta) held with `weights` (equal by default)
+def portfolio_parameters(funds, returns_column, weights=None, market_sd=MARKET_SD):
+    mu = funds[returns_column].to_numpy(dtype=float) / 100
+    sd = funds["sd"].to_numpy(dtype=float) / 100
+    beta = funds["beta"].to_numpy(dtype=float)
+
+    # Missing statistics count as the average of the selected funds
+    mu = np.where(np.isnan(mu), np.nanmean(mu), mu)
+    sd = np.where(np.isnan(sd), np.nanmean(sd), sd)
+    beta = np.where(np.isnan(beta), np.nanmean(beta), beta)
+
+    if weights is None:
+        weights = np.full(len(mu), 1 / len(mu))
+    weights = np.asarray(weights, dtype=float)
+    weights = weights / weights.sum()
+
+    idio_var = np.clip(sd ** 2 - (beta * market_sd) ** 2, 0, None)
+    return float(weights @ mu), float(weights @ beta), float(np.sqrt(weights ** 2 @ idio_var))
+
+
+def _simulate_chunk(n_paths, months, contribution, mu, beta, idio_sd, market_sd, record_every, seed):
+    rng = np.random.default_rng(seed)
+    wealth = np.zeros(n_paths)
+    recorded = np.empty((months // record_every, n_paths), dtype=np.float32)
+
+    monthly_mean = np.float32(mu / 12)
+    monthly_sd = np.float32(np.sqrt(((beta * market_sd) ** 2 + idio_sd ** 2) / 12))
+
+    # Drawn one year at a time (float32) so memory stays bounded for long horizons
+    returns = np.empty((12, n_paths), dtype=np.float32)
+    for year_start in range(0, months, 12):
+        block = min(12, months - year_start)
+        rng.standard_normal(out=returns[:block], dtype=np.float32)
+        returns[:block] *= monthly_sd
+        returns[:block] += 1 + monthly_mean
+        np.maximum(returns[:block], 1 + MIN_MONTHLY_RETURN, out=returns[:block])
+        for month in range(block):
+            # Contribution at the start of the month, then the month's growth factor
+            wealth += contribution
+            wealth *= returns[month]
+            step = year_start + month + 1
+            if step % record_every == 0:
+                recorded[step // record_every - 1] = wealth
+    return recorded
+
+
+def _simulate_chunk_args(args):
+    return _simulate_chunk(*args)
+
+
+# Percentile bands of portfolio value for `monthly_contribution` invested every month for
+# `years`. Returns a frame with one row per recorded period (yearly by default): Year,
+# contributed (total paid in) and one column per percentile, e.g. p5, p50, p95.
+# Paths are simulated in chunks of chunk_size; with processes set, chunks run in a pool.
+def simulate_sip(monthly_contribution, mu, beta, idio_sd, years=YEARS, n_paths=N_PATHS,
+                 market_sd=MARKET_SD, percentiles=PERCENTILES, record_every=12,
+                 chunk_size=CHUNK_SIZE, processes=None, seed=None):
+    months = int(years * 12)
+    seeds = np.random.SeedSequence(seed).spawn(-(-n_paths // chunk_size))
+    tasks = [
+        (min(chunk_size, n_paths - i * chunk_size), months, monthly_contribution, mu, beta, idio_sd,
+         market_sd, record_every, chunk_seed)
+        for i, chunk_seed in enumerate(seeds)
+    ]
+
+    if processes and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            chunks = list(pool.map(_simulate_chunk_args, tasks))
+    else:
+        chunks = [_simulate_chunk(*task) for task in tasks]
+    recorded = np.concatenate(chunks, axis=1)
+
+    periods = np.arange(1, months // record_every + 1)
+    bands = pd.DataFrame({
+        "Year": periods * record_every / 12,
+        "contributed": periods * record_every * monthly_contribution,
+    })
+    values = np.percentile(recorded, percentiles, axis=1)
+    for p, row in zip(percentiles, values):
+        bands[f"p{p}"] = row
+    return bands
+
+
+# Convenience wrapper: project a SIP into the given rows of a fund table (e.g. the
+# recommended funds from recommender.FundUniverse.funds)
+def project_sip(funds, monthly_contribution, returns_column, weights=None, **kwargs):
+    market_sd = kwargs.get("market_sd", MARKET_SD)
+    mu, beta, idio_sd = portfolio_parameters(funds, returns_column, weights, market_sd)
+    return simulate_sip(monthly_contribution, mu, beta, idio_sd, **kwargs)
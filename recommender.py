@@ -0,0 +1,171 @@
+# Fund recommendations for batches of client profiles, scored against the fund
+# universe in FINAL_DATASET. Like analytics.py this only depends on NumPy and pandas.
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from analytics import RISK_RETURNS_COLUMN
+
+# Metrics used for ranking; each is z-scored across the fund universe
+SCORE_METRICS = ["sharpe", "sortino", "alpha", "rating", "expense_ratio", "sd", "beta"]
+
+# Weight of each metric per client risk level (negative weights penalise a metric)
+RISK_WEIGHTS = {
+    "Low":    {"sharpe": 0.25, "sortino": 0.25, "alpha": 0.10, "rating": 0.15, "expense_ratio": -0.15, "sd": -0.25, "beta": -0.15},
+    "Medium": {"sharpe": 0.30, "sortino": 0.20, "alpha": 0.20, "rating": 0.15, "expense_ratio": -0.15, "sd": -0.10, "beta": -0.05},
+    "High":   {"sharpe": 0.25, "sortino": 0.15, "alpha": 0.35, "rating": 0.10, "expense_ratio": -0.10, "sd": 0.00, "beta": 0.00},
+}
+
+# Fund risk levels ordered from safest to riskiest
+FUND_RISK_TIERS = {"Negligible": 0, "Low": 1, "Medium": 2, "High": 3, "Severe": 4}
+
+# Riskiest fund tier each client risk level may be recommended
+CLIENT_RISK_CAP = {"Low": 1, "Medium": 2, "High": 4}
+
+# Profiles scored per block; bounds the (profiles x funds) score matrix in memory
+CHUNK_SIZE = 4096
+
+# Batches at least this large are split across worker processes when processes is set
+POOL_THRESHOLD = 50_000
+
+
+# One row per scheme_name with the numeric metrics averaged over the dataset rows,
+# stored as NumPy arrays so scoring is pure matrix work
+class FundUniverse:
+    def __init__(self, dataset):
+        numeric = SCORE_METRICS + ["min_sip", "min_lumpsum"] + sorted(set(RISK_RETURNS_COLUMN.values()))
+        funds = dataset.groupby("scheme_name", sort=True, observed=True).agg(
+            {**{column: "mean" for column in numeric}, "category": "first", "risk_level": "first"}
+        )
+
+        self.funds = funds.reset_index()
+        self.names = self.funds["scheme_name"].to_numpy(dtype=object)
+        # A minimum of 0 means the fund does not offer that route; inf keeps it unaffordable
+        min_sip = self.funds["min_sip"].to_numpy(dtype=float)
+        min_lumpsum = self.funds["min_lumpsum"].to_numpy(dtype=float)
+        self.min_sip = np.where(min_sip > 0, min_sip, np.inf)
+        self.min_lumpsum = np.where(min_lumpsum > 0, min_lumpsum, np.inf)
+        self.risk_tier = (
+            self.funds["risk_level"].map(FUND_RISK_TIERS).fillna(max(FUND_RISK_TIERS.values())).to_numpy(dtype=np.int8)
+        )
+
+        # z-score each metric, missing values count as the universe average
+        metrics = self.funds[SCORE_METRICS].to_numpy(dtype=float)
+        std = np.nanstd(metrics, axis=0)
+        z = (metrics - np.nanmean(metrics, axis=0)) / np.where(std > 0, std, 1)
+        z = np.nan_to_num(z)
+
+        # One score vector per client risk level: (risk levels x metrics) @ (metrics x funds)
+        self.risk_levels = list(RISK_WEIGHTS)
+        weights = np.array([[RISK_WEIGHTS[level][metric] for metric in SCORE_METRICS] for level in self.risk_levels])
+        self.scores = weights @ z.T
+
+        caps = np.array([CLIENT_RISK_CAP[level] for level in self.risk_levels])
+        self.eligible = self.risk_tier[None, :] <= caps[:, None]
+
+    def __len__(self):
+        return len(self.names)
+
+
+def _risk_codes(universe, risk_levels):
+    # Unknown risk levels get -1 and no recommendations, rather than the riskiest weights
+    lookup = {level: code for code, level in enumerate(universe.risk_levels)}
+    return np.array([lookup.get(level, -1) for level in risk_levels], dtype=np.intp)
+
+
+def _top_k(scores, k):
+    # argpartition picks the k best per row in linear time, only those k are sorted
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def _score_block(universe, risk_codes, sip_budget, lumpsum_budget, k):
+    # Affordable if a positive monthly budget covers the minimum SIP or a positive lump sum
+    # covers the minimum lump sum
+    affordable = ((sip_budget > 0)[:, None] & (sip_budget[:, None] >= universe.min_sip[None, :])) | (
+        (lumpsum_budget > 0)[:, None] & (lumpsum_budget[:, None] >= universe.min_lumpsum[None, :])
+    )
+    known = risk_codes >= 0
+    codes = np.where(known, risk_codes, 0)
+    mask = affordable & universe.eligible[codes] & known[:, None]
+    scores = np.where(mask, universe.scores[codes], -np.inf)
+
+    fund_index, fund_scores = _top_k(scores, k)
+
+    # Slots with no eligible fund are reported as -1 / NaN
+    missing = np.isneginf(fund_scores)
+    fund_index[missing] = -1
+    fund_scores[missing] = np.nan
+    return fund_index, fund_scores
+
+
+def _score_range(universe, risk_codes, sip_budget, lumpsum_budget, k, chunk_size):
+    n = len(risk_codes)
+    k = min(k, len(universe))
+    fund_index = np.empty((n, k), dtype=np.intp)
+    fund_scores = np.empty((n, k), dtype=float)
+    for start in range(0, n, chunk_size):
+        stop = start + chunk_size
+        fund_index[start:stop], fund_scores[start:stop] = _score_block(
+            universe, risk_codes[start:stop], sip_budget[start:stop], lumpsum_budget[start:stop], k
+        )
+    return fund_index, fund_scores
+
+
+# Worker processes receive the universe once through the pool initializer
+_worker_universe = None
+
+
+def _init_worker(universe):
+    global _worker_universe
+    _worker_universe = universe
+
+
+def _score_range_in_worker(args):
+    return _score_range(_worker_universe, *args)
+
+
+# Recommend the top-k funds for every profile in a batch.
+# income, expenditure, savings and risk_levels are equal-length sequences, the same
+# inputs as investment_advisor.process_financial_data. savings is the monthly SIP budget;
+# lumpsum is the one-off amount available, defaulting to the monthly surplus
+# (income - expenditure). Returns (fund_index, scores), both of shape (n, k):
+# positions into universe.names / universe.funds, -1 and NaN where fewer than k funds qualify.
+# Profiles with a risk level outside RISK_WEIGHTS get no funds.
+# With processes set, batches of POOL_THRESHOLD profiles or more are scored in a process pool.
+def recommend_batch(universe, income, expenditure, savings, risk_levels, k=5, lumpsum=None,
+                    chunk_size=CHUNK_SIZE, processes=None):
+    sip_budget = np.asarray(savings, dtype=float)
+    if lumpsum is None:
+        lumpsum = np.asarray(income, dtype=float) - np.asarray(expenditure, dtype=float)
+    lumpsum_budget = np.broadcast_to(np.asarray(lumpsum, dtype=float), sip_budget.shape)
+    risk_codes = _risk_codes(universe, risk_levels)
+
+    if not processes or len(risk_codes) < POOL_THRESHOLD:
+        return _score_range(universe, risk_codes, sip_budget, lumpsum_budget, k, chunk_size)
+
+    # Contiguous slices, a few per worker so slow slices do not hold up the rest
+    bounds = np.linspace(0, len(risk_codes), processes * 4 + 1, dtype=int)
+    tasks = [
+        (risk_codes[start:stop], sip_budget[start:stop], lumpsum_budget[start:stop], k, chunk_size)
+        for start, stop in zip(bounds[:-1], bounds[1:])
+        if stop > start
+    ]
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(universe,)) as pool:
+        results = list(pool.map(_score_range_in_worker, tasks))
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+
+# Long-format table of a batch result: one row per (profile, rank) with the fund details
+def recommendations_frame(universe, fund_index, fund_scores):
+    profile, rank = np.nonzero(fund_index >= 0)
+    chosen = fund_index[profile, rank]
+    frame = universe.funds.iloc[chosen][["scheme_name", "category", "risk_level", "min_sip", "min_lumpsum"]]
+    frame = frame.reset_index(drop=True)
+    frame.insert(0, "rank", rank + 1)
+    frame.insert(0, "profile", profile)
+    frame["score"] = fund_scores[profile, rank]
+    return frame
@@ -0,0 +1,279 @@
+# Long-lived T5 inference service for generate_answer. The fine-tuned model is loaded once;
+# concurrent questions are micro-batched (padded only to the longest input in the batch)
+# and answers are cached per (question, context).
+#
+#     python t5_server.py --model C:/Users/Sheid_heda/Desktop/Oviya/finetuned_model --quantize
+#
+# POST /generate        {"question": ..., "context": ...}  -> {"answer", "cached", "latency_ms"}
+# POST /generate_batch  {"items": [{"question", "context"}, ...]} -> {"answers": [...]}
+# GET  /metrics         latency percentiles, cache hit rate and batch sizes
+# GET  /metrics/prometheus  the same process's instrumentation spans and counters (with --instrument)
+# GET  /health
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import instrumentation
+from instrumentation import count, observe, span
+
+DEFAULT_PORT = 8600
+
+# Same generation settings as Untitled-1.py
+MAX_INPUT_LENGTH = 512
+MAX_OUTPUT_LENGTH = 50
+NUM_BEAMS = 5
+
+# A batch is sent to the model when it is full or its oldest request has waited this long
+MAX_BATCH_SIZE = 16
+MAX_WAIT_MS = 10
+
+CACHE_SIZE = 4096
+
+# Latencies kept for the percentile metrics
+LATENCY_WINDOW = 2048
+
+
+class T5Generator:
+    def __init__(self, model_path, quantize=False, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS,
+                 cache_size=CACHE_SIZE, num_beams=NUM_BEAMS, max_length=MAX_OUTPUT_LENGTH):
+        # Imported here so importing this module (e.g. for the HTTP client) stays cheap
+        import torch
+        from transformers import T5ForConditionalGeneration, T5Tokenizer
+
+        self.torch = torch
+        self.tokenizer = T5Tokenizer.from_pretrained(model_path)
+        model = T5ForConditionalGeneration.from_pretrained(model_path)
+        model.eval()
+        if quantize:
+            # int8 weights for the Linear layers, activations stay float; CPU only
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.num_beams = num_beams
+        self.max_length = max_length
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {"requests": 0, "cache_hits": 0, "batches": 0, "batched_items": 0}
+
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    # Blocking answer for one question; safe to call from many threads at once
+    def generate(self, question, context):
+        return self.submit(question, context).result()[0]
+
+    def generate_batch(self, items):
+        futures = [self.submit(question, context) for question, context in items]
+        return [future.result()[0] for future in futures]
+
+    # Future resolving to (answer, cached); repeated and concurrent identical pairs share one generation
+    def submit(self, question, context):
+        key = (question, context)
+        started = time.perf_counter()
+        with self._lock:
+            self._counters["requests"] += 1
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._counters["cache_hits"] += 1
+                self._latencies.append(time.perf_counter() - started)
+                count("t5_cache", result="hit")
+                future = Future()
+                future.set_result((self._cache[key], True))
+                return future
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._counters["cache_hits"] += 1
+                count("t5_cache", result="coalesced")
+                return future
+
+            future = Future()
+            self._in_flight[key] = future
+        count("t5_cache", result="miss")
+        self._queue.put((key, future, started))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch):
+        texts = [f"question: {question} context: {context}" for (question, context), _, _ in batch]
+        try:
+            # Pad to the longest input in this batch only
+            with span("tokenize"):
+                inputs = self.tokenizer(texts, return_tensors="pt", padding="longest",
+                                        max_length=MAX_INPUT_LENGTH, truncation=True)
+            with span("model_generate"), self.torch.inference_mode():
+                outputs = self.model.generate(
+                    inputs.input_ids,
+                    attention_mask=inputs.attention_mask,
+                    max_length=self.max_length,
+                    num_beams=self.num_beams,
+                    early_stopping=True,
+                )
+            answers = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+            observe("t5_batch_size", len(batch))
+        except Exception as e:
+            with self._lock:
+                for key, future, _ in batch:
+                    self._in_flight.pop(key, None)
+                    future.set_exception(e)
+            return
+
+        finished = time.perf_counter()
+        with self._lock:
+            self._counters["batches"] += 1
+            self._counters["batched_items"] += len(batch)
+            for (key, future, started), answer in zip(batch, answers):
+                self._cache[key] = answer
+                self._in_flight.pop(key, None)
+                self._latencies.append(finished - started)
+                future.set_result((answer, False))
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def metrics(self):
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            counters = dict(self._counters)
+            cached = len(self._cache)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+        return {
+            **counters,
+            "cache_entries": cached,
+            "cache_hit_rate": counters["cache_hits"] / counters["requests"] if counters["requests"] else 0.0,
+            "mean_batch_size": counters["batched_items"] / counters["batches"] if counters["batches"] else 0.0,
+            "latency_ms": {"p50": float(p50), "p95": float(p95), "p99": float(p99)},
+        }
+
+
+def make_server(generator, host="127.0.0.1", port=DEFAULT_PORT):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                self._send(200, generator.metrics())
+            elif self.path == "/metrics/prometheus":
+                body = instrumentation.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.path == "/health":
+                self._send(200, {"status": "ok"})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            started = time.perf_counter()
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/generate":
+                    answer, cached = generator.submit(request["question"], request.get("context", "")).result()
+                    response = {"answer": answer, "cached": cached}
+                elif self.path == "/generate_batch":
+                    items = [(item["question"], item.get("context", "")) for item in request["items"]]
+                    response = {"answers": generator.generate_batch(items)}
+                else:
+                    self._send(404, {"error": "not found"})
+                    return
+            except (KeyError, TypeError, ValueError) as e:
+                self._send(400, {"error": f"bad request: {e}"})
+                return
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+                return
+            response["latency_ms"] = (time.perf_counter() - started) * 1000
+            self._send(200, response)
+
+        def log_message(self, format, *args):
+            pass
+
+    # One thread per connection; they all feed the generator's single batching queue
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+# Client side, used by app.py when T5_SERVER_URL is set
+class T5Client:
+    def __init__(self, url, timeout=30):
+        import requests
+
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def generate(self, question, context):
+        response = self.session.post(f"{self.url}/generate", json={"question": question, "context": context},
+                                     timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["answer"]
+
+    def metrics(self):
+        response = self.session.get(f"{self.url}/metrics", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", required=True, help="path of the fine-tuned model directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--quantize", action="store_true", help="int8 dynamic quantization (CPU)")
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--instrument", action="store_true",
+                        help="record spans and cache counters, served at /metrics/prometheus")
+    args = parser.parse_args()
+    if args.instrument:
+        instrumentation.enable()
+
+    generator = T5Generator(args.model, quantize=args.quantize, max_batch_size=args.max_batch_size,
+                            max_wait_ms=args.max_wait_ms)
+    server = make_server(generator, args.host, args.port)
+    print(f"T5 inference server listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
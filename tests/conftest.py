@@ -0,0 +1,21 @@
+# Regression tests for the advisor modules. Run from the repository root:
+#     python -m pytest tests
+import os
+import sys
+
+import pytest
+
+# The advisor modules live in the repository root; the synthetic data generator is shared
+# with the benchmarks
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from synthetic import fund_dataset  # noqa: E402
+
+
+# Small FINAL_DATASET-shaped frame, prepared the way the app loads it
+@pytest.fixture(scope="session")
+def dataset():
+    from dataset_cache import prepare_dataset
+    return prepare_dataset(fund_dataset(5_000, seed=1))
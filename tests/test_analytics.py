@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import RETURNS_COLUMNS, GrowthIndex
+
+
+# The original investment_advisor.get_investment_growth
+def reference_growth(dataset, risk_level, returns_column):
+    filtered_data = dataset[dataset["risk_level"] == risk_level]
+    yearly_data = filtered_data.groupby('Year').agg({returns_column: 'mean'}).reset_index()
+    yearly_data['cumulative_return'] = (1 + yearly_data[returns_column] / 100).cumprod() - 1
+    return yearly_data
+
+
+@pytest.mark.parametrize("returns_column", RETURNS_COLUMNS)
+def test_growth_matches_groupby_cumprod(dataset, returns_column):
+    # Plain object/float columns, as pd.read_excel produces them
+    frame = dataset.astype({"risk_level": object, "Year": np.int64, returns_column: np.float64})
+    index = GrowthIndex(frame)
+    for level in frame["risk_level"].unique():
+        expected = reference_growth(frame, level, returns_column)
+        actual = index.growth(level, returns_column)
+        np.testing.assert_array_equal(actual["Year"].to_numpy(), expected["Year"].to_numpy())
+        np.testing.assert_allclose(actual[returns_column].to_numpy(), expected[returns_column].to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(actual["cumulative_return"].to_numpy(),
+                                   expected["cumulative_return"].to_numpy(), rtol=1e-12)
+
+
+def test_unknown_risk_level_has_no_growth(dataset):
+    index = GrowthIndex(dataset)
+    assert index.growth("Unknown") is None
+    assert np.isnan(index.batch_total_growth(["Unknown"])).all()
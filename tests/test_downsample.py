@@ -0,0 +1,45 @@
+import math
+
+import numpy as np
+import pytest
+
+from downsample import lttb
+
+
+# Straightforward LTTB (Steinarsson 2013), one point per bucket in a Python loop
+def reference_lttb(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return list(range(n))
+    every = (n - 2) / (n_out - 2)
+    selected = [0]
+    a = 0
+    for i in range(n_out - 2):
+        avg_start = math.floor((i + 1) * every) + 1
+        avg_end = min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+
+        start = math.floor(i * every) + 1
+        stop = math.floor((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, stop):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+@pytest.mark.parametrize("n, n_out", [(10, 3), (100, 10), (1_000, 37), (5_003, 2_000), (20_000, 2_000)])
+def test_lttb_matches_reference(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 1_000, n))
+    y = np.cumsum(rng.normal(0, 1, n))
+    assert lttb(x, y, n_out).tolist() == reference_lttb(x.tolist(), y.tolist(), n_out)
+
+
+def test_lttb_keeps_short_series():
+    assert lttb([1, 2, 3], [4, 5, 6], 10).tolist() == [0, 1, 2]
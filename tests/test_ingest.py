@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from ingest import ingest, query_partitions
+
+
+@pytest.fixture(scope="module")
+def partitions(dataset, tmp_path_factory):
+    directory = tmp_path_factory.mktemp("ingest")
+    source = directory / "funds.csv"
+    dataset.to_csv(source, index=False)
+    root = directory / "parts"
+    ingest(str(source), str(root), chunk_size=1_000)
+    return str(root)
+
+
+@pytest.mark.parametrize("years", [2014, np.int64(2014), [2014], np.array([2014])])
+def test_years_accept_scalars_and_arrays(dataset, partitions, years):
+    result = query_partitions(partitions, years=years, columns=["scheme_name", "Year"])
+    assert len(result) == (dataset["Year"] == 2014).sum()
+    assert set(result["Year"].astype(int)) == {2014}
+
+
+@pytest.mark.parametrize("risk_levels", ["Low", np.str_("Low"), ["Low", "High"], np.array(["Low", "High"])])
+def test_risk_levels_accept_scalars_and_arrays(dataset, partitions, risk_levels):
+    result = query_partitions(partitions, risk_levels=risk_levels, columns=["scheme_name", "risk_level"])
+    expected = np.atleast_1d(risk_levels).tolist()
+    assert len(result) == dataset["risk_level"].isin(expected).sum()
+    assert set(result["risk_level"].astype(str)) == set(expected)
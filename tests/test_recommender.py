@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recommender import SCORE_METRICS, FundUniverse, _risk_codes, _score_block, recommend_batch
+
+
+# Three Low-risk funds: A offers both routes, B has no SIP (min_sip 0), C has no lump sum
+@pytest.fixture
+def universe():
+    funds = pd.DataFrame({
+        "scheme_name": ["A", "B", "C"],
+        "min_sip": [500, 0, 100],
+        "min_lumpsum": [1000, 1000, 0],
+        "returns_1yr": [5.0, 6.0, 7.0],
+        "returns_3yr": [5.0, 6.0, 7.0],
+        "returns_5yr": [5.0, 6.0, 7.0],
+        "category": ["Debt", "Debt", "Debt"],
+        "risk_level": ["Low", "Low", "Low"],
+        **{metric: [1.0, 2.0, 3.0] for metric in SCORE_METRICS},
+    })
+    return FundUniverse(funds)
+
+
+def chosen(universe, risk_level, sip_budget, lumpsum_budget):
+    fund_index, _ = _score_block(universe, _risk_codes(universe, [risk_level]),
+                                 np.array([sip_budget], dtype=float), np.array([lumpsum_budget], dtype=float), k=3)
+    return sorted(universe.names[fund] for fund in fund_index[0] if fund >= 0)
+
+
+def test_zero_budgets_get_no_funds(universe):
+    assert chosen(universe, "Low", 0, 0) == []
+    assert chosen(universe, "Low", 0, -500) == []
+
+
+def test_zero_minimum_means_route_not_offered(universe):
+    # Only C's SIP (100) fits; B's min_sip of 0 does not make it affordable
+    assert chosen(universe, "Low", 100, 0) == ["C"]
+    # Only A and B take a lump sum; C's min_lumpsum of 0 does not count
+    assert chosen(universe, "Low", 0, 1000) == ["A", "B"]
+    assert chosen(universe, "Low", 500, 1000) == ["A", "B", "C"]
+
+
+def test_unknown_risk_level_gets_no_funds(universe):
+    fund_index, fund_scores = recommend_batch(universe, [10_000], [1_000], [5_000], ["low"], k=3)
+    assert (fund_index == -1).all()
+    assert np.isnan(fund_scores).all()
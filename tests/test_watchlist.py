@@ -0,0 +1,116 @@
+import asyncio
+import datetime as dt
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from alpha_vantage_client import parse_time_series
+from watchlist import SeriesStore, merge_series, refresh_symbol
+
+# Friday 2026-10-16, one hour after the New York close
+NOW = dt.datetime(2026, 10, 16, 21, 0, tzinfo=dt.timezone.utc)
+BEFORE_CLOSE = dt.datetime(2026, 10, 16, 19, 0, tzinfo=dt.timezone.utc).timestamp()
+
+
+def frame(dates, close):
+    index = pd.DatetimeIndex(pd.to_datetime(dates), name="Date")
+    return pd.DataFrame({"close": np.asarray(close, dtype=float)}, index=index)
+
+
+def payload(dates):
+    return {"Time Series (Daily)": {
+        date: {"1. open": "1.0", "2. high": "1.0", "3. low": "1.0", "4. close": "2.0", "5. volume": "10"}
+        for date in dates
+    }}
+
+
+class RecordingClient:
+    def __init__(self, dates):
+        self.dates = dates
+        self.calls = []
+
+    def get(self, function, symbol, rate_limit_timeout=None, **params):
+        self.calls.append(params["outputsize"])
+        return payload(self.dates)
+
+
+def test_merge_series_appends_new_days_and_replaces_the_last():
+    stored = frame(["2026-10-13", "2026-10-14", "2026-10-15"], [1, 2, 3])
+    update = frame(["2026-10-14", "2026-10-15", "2026-10-16"], [20, 30, 40])
+    merged = merge_series(stored, update)
+    assert merged.index.strftime("%Y-%m-%d").tolist() == ["2026-10-13", "2026-10-14", "2026-10-15", "2026-10-16"]
+    # Earlier stored days are kept, the overlapping last day is replaced
+    assert merged["close"].tolist() == [1, 2, 30, 40]
+
+
+def test_merge_series_without_new_rows_keeps_stored():
+    stored = frame(["2026-10-15", "2026-10-16"], [1, 2])
+    assert merge_series(stored, frame(["2026-10-10"], [9])) is stored
+    assert merge_series(None, stored) is stored
+
+
+def refresh(client, store, symbol="AAA"):
+    return asyncio.run(refresh_symbol(client, store, symbol, asyncio.Semaphore(1), now=NOW))
+
+
+def stored_series(store, dates, modified):
+    store.save("AAA", frame(dates, np.ones(len(dates))))
+    os.utime(store._path("AAA"), (modified, modified))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SeriesStore(str(tmp_path))
+
+
+def test_first_refresh_downloads_full_history(store):
+    client = RecordingClient(["2026-10-15", "2026-10-16"])
+    result = refresh(client, store)
+    assert client.calls == ["full"]
+    assert len(result) == 2 and store.load("AAA") is not None
+
+
+def test_recent_series_uses_compact(store):
+    stored_series(store, ["2026-10-14", "2026-10-15"], BEFORE_CLOSE)
+    client = RecordingClient(["2026-10-15", "2026-10-16"])
+    result = refresh(client, store)
+    assert client.calls == ["compact"]
+    assert result.index[-1] == pd.Timestamp("2026-10-16")
+
+
+def test_old_series_downloads_full_history(store):
+    stored_series(store, ["2026-01-02"], BEFORE_CLOSE)
+    client = RecordingClient(["2026-10-16"])
+    refresh(client, store)
+    assert client.calls == ["full"]
+
+
+def test_series_saved_after_the_close_is_not_requested(store):
+    stored_series(store, ["2026-10-15", "2026-10-16"], NOW.timestamp())
+    client = RecordingClient([])
+    result = refresh(client, store)
+    assert client.calls == []
+    assert len(result) == 2
+
+
+def test_parse_time_series_orders_and_types_columns():
+    data = {"Time Series (Daily)": {
+        "2026-10-16": {"1. open": "3.5", "2. high": "4", "3. low": "3", "4. close": "3.75", "5. volume": "300"},
+        "2026-10-14": {"1. open": "1.5", "2. high": "2", "3. low": "1", "4. close": "1.75", "5. volume": "100"},
+        "2026-10-15": {"1. open": "2.5", "2. high": "3", "3. low": "2", "4. close": "2.75", "5. volume": "200"},
+    }}
+    parsed = parse_time_series(data)
+    assert parsed.index.name == "Date"
+    assert parsed.index.is_monotonic_increasing
+    assert parsed.index.dtype == "datetime64[ns]"
+    assert list(parsed.columns) == ["open", "high", "low", "close", "volume"]
+    assert parsed["close"].tolist() == [1.75, 2.75, 3.75]
+    assert parsed["close"].dtype == np.float64
+    assert parsed["volume"].dtype == np.int64
+    assert parsed["volume"].tolist() == [100, 200, 300]
+
+    compact = parse_time_series(data, dtype=np.float32)
+    assert compact["open"].dtype == np.float32
+    assert compact["volume"].dtype == np.int64
@@ -0,0 +1,150 @@
+# Concurrent refresh of a watch-list of daily series on top of AlphaVantageClient.
+# Each symbol's series is stored locally; the first refresh downloads the full history
+# and later refreshes only request outputsize=compact (the last 100 trading days) and
+# append the new rows; a series saved since the last market close is not requested at all.
+# Calls wait for the client's token bucket, which keeps the whole refresh within quota.
+import asyncio
+import datetime as dt
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from alpha_vantage_client import AlphaVantageError, last_market_close, parse_time_series
+
+# pyarrow is optional, series are stored as CSV without it
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+DAILY_FUNCTION = "TIME_SERIES_DAILY"
+DAILY_KEY = "Time Series (Daily)"
+
+# A compact response covers 100 trading days; beyond this gap a full download is needed
+COMPACT_MAX_GAP = dt.timedelta(days=130)
+
+# Symbols fetched at the same time; the rate limiter still spaces the actual calls
+MAX_CONCURRENCY = 5
+
+
+class SeriesStore:
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+
+    def _path(self, symbol):
+        suffix = ".arrow" if feather is not None else ".csv"
+        return os.path.join(self.store_dir, symbol.upper() + suffix)
+
+    # Time the stored series was last written, or None if there is none
+    def modified(self, symbol):
+        try:
+            return os.path.getmtime(self._path(symbol))
+        except OSError:
+            return None
+
+    def load(self, symbol):
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return None
+        if feather is not None:
+            frame = feather.read_table(path, memory_map=True).to_pandas()
+        else:
+            frame = pd.read_csv(path, parse_dates=["Date"])
+        return frame.set_index("Date")
+
+    def save(self, symbol, frame):
+        os.makedirs(self.store_dir, exist_ok=True)
+        path = self._path(symbol)
+
+        # A unique temp file per writer, so sessions refreshing the same symbol do not collide
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            if feather is not None:
+                feather.write_feather(frame.reset_index(), tmp_path, compression="uncompressed")
+            else:
+                frame.reset_index().to_csv(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+# Append the rows of `update` that are newer than `stored`; the overlapping last day is
+# replaced too, since a series fetched before the close may hold a partial day
+def merge_series(stored, update):
+    if stored is None or stored.empty:
+        return update
+    update = update[update.index >= stored.index[-1]]
+    return pd.concat([stored[stored.index < stored.index[-1]], update]) if not update.empty else stored
+
+
+# rate_limit_timeout is passed to client.get; None waits for a token instead of failing
+async def refresh_symbol(client, store, symbol, semaphore, dtype=np.float64, now=None, rate_limit_timeout=None):
+    symbol = symbol.upper()
+    stored = store.load(symbol)
+    now = now or dt.datetime.now(dt.timezone.utc)
+
+    outputsize = "full"
+    if stored is not None and not stored.empty:
+        # Written after the latest close, so it already holds every published day
+        modified = store.modified(symbol)
+        if modified is not None and modified >= last_market_close(now).timestamp():
+            return stored
+        if now.date() - stored.index[-1].date() <= COMPACT_MAX_GAP:
+            outputsize = "compact"
+
+    async with semaphore:
+        # The client is blocking, so each call runs in a worker thread
+        payload = await asyncio.to_thread(client.get, DAILY_FUNCTION, symbol, rate_limit_timeout=rate_limit_timeout,
+                                          outputsize=outputsize)
+
+    if DAILY_KEY not in payload:
+        raise AlphaVantageError(f"No daily series returned for {symbol}")
+    frame = merge_series(stored, parse_time_series(payload, dtype))
+    # A cached payload usually brings nothing new; only write when the series changed
+    if stored is None or not frame.equals(stored):
+        store.save(symbol, frame)
+    return frame
+
+
+# Refresh every symbol concurrently. Returns (series, errors): series maps each symbol to its
+# up-to-date frame, or the previously stored one when its refresh failed; errors maps the
+# failed symbols to their exception. dtype=np.float32 halves the memory of the price columns.
+# Symbols without a stored series are requested first, so they take the first tokens.
+async def refresh_watchlist(client, store, symbols, max_concurrency=MAX_CONCURRENCY, dtype=np.float64,
+                            rate_limit_timeout=None):
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols if symbol))
+    order = sorted(symbols, key=lambda symbol: store.modified(symbol) is not None)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = await asyncio.gather(
+        *(refresh_symbol(client, store, symbol, semaphore, dtype, rate_limit_timeout=rate_limit_timeout)
+          for symbol in order),
+        return_exceptions=True,
+    )
+    results = dict(zip(order, results))
+
+    series, errors = {}, {}
+    for symbol in symbols:
+        result = results[symbol]
+        if isinstance(result, Exception):
+            errors[symbol] = result
+            try:
+                stored = store.load(symbol)
+            except Exception:
+                # An unreadable store is reported through the refresh error above
+                stored = None
+            if stored is not None:
+                series[symbol] = stored
+        else:
+            series[symbol] = result
+    return series, errors
+
+
+# Blocking wrapper for callers without an event loop, such as the Streamlit script
+def refresh_watchlist_sync(client, store, symbols, max_concurrency=MAX_CONCURRENCY, dtype=np.float64,
+                           rate_limit_timeout=None):
+    return asyncio.run(refresh_watchlist(client, store, symbols, max_concurrency, dtype, rate_limit_timeout))